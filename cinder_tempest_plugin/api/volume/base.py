@@ -23,9 +23,36 @@ from tempest.lib.common.utils import data_utils
 from tempest.lib.common.utils import test_utils
 from tempest import test
 
+from cinder_tempest_plugin.common import instrumentation
+from cinder_tempest_plugin.common import profiling
+from cinder_tempest_plugin.common import tracing
+from cinder_tempest_plugin.common import waiters as volume_waiters
+
 CONF = config.CONF
 
 
+class _LazyClient(object):
+    """Service client built on first access
+
+    The client is cached in the __dict__ of the test class it was looked up
+    from, so that classes with different credentials never share a client,
+    while a class assigning the attribute in setup_clients still overrides
+    it as before. Its requests are timed by the request instrumentation.
+    """
+
+    def __init__(self, build):
+        self.build = build
+
+    def __set_name__(self, owner, name):
+        self.cache_name = '_lazy_%s' % name
+
+    def __get__(self, instance, owner):
+        if self.cache_name not in owner.__dict__:
+            setattr(owner, self.cache_name,
+                    instrumentation.instrument(self.build(owner)))
+        return owner.__dict__[self.cache_name]
+
+
 class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
                      test.BaseTestCase):
     """Base test case class for all Cinder API tests."""
@@ -44,15 +71,15 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
             cls.min_microversion, cls.max_microversion,
             CONF.volume.min_microversion, CONF.volume.max_microversion)
 
-    @classmethod
-    def setup_clients(cls):
-        super(BaseVolumeTest, cls).setup_clients()
-        cls.backups_client = cls.os_primary.backups_client_latest
-        cls.volumes_client = cls.os_primary.volumes_client_latest
-        cls.snapshots_client = cls.os_primary.snapshots_client_latest
-        cls.volume_revert_client = (
-            cls.os_primary.volume_revert_v3.VolumeRevertClient()
-        )
+    # The clients are only built by the classes using them
+    backups_client = _LazyClient(
+        lambda cls: cls.os_primary.backups_client_latest)
+    volumes_client = _LazyClient(
+        lambda cls: cls.os_primary.volumes_client_latest)
+    snapshots_client = _LazyClient(
+        lambda cls: cls.os_primary.snapshots_client_latest)
+    volume_revert_client = _LazyClient(
+        lambda cls: cls.os_primary.volume_revert_v3.VolumeRevertClient())
 
     @classmethod
     def setup_credentials(cls):
@@ -61,6 +88,9 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
 
     def setUp(self):
         super(BaseVolumeTest, self).setUp()
+        profiling.profile_test(self)
+        self.addCleanup(volume_waiters.add_wait_details, self,
+                        volume_waiters.mark())
 
     @classmethod
     def resource_setup(cls):
@@ -73,6 +103,7 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
             volume_microversion=cls.request_microversion)
 
     @classmethod
+    @tracing.traced(resource_kind='cinder.volume')
     def create_volume(cls, wait_until='available', **kwargs):
         """Wrapper utility that returns a test volume.
 
@@ -97,18 +128,23 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
 
         volume = cls.volumes_client.create_volume(**kwargs)['volume']
         cls.addClassResourceCleanup(
-            cls.volumes_client.wait_for_resource_deletion, volume['id'])
+            volume_waiters.wait_for_resource_deletion, cls.volumes_client,
+            volume['id'])
         cls.addClassResourceCleanup(test_utils.call_and_ignore_notfound_exc,
                                     cls.volumes_client.delete_volume,
                                     volume['id'])
         if wait_until:
-            waiters.wait_for_volume_resource_status(cls.volumes_client,
-                                                    volume['id'], wait_until)
+            volume_waiters.wait_for_volume_resource_status(
+                cls.volumes_client, volume['id'], wait_until)
         return volume
 
     @classmethod
-    def create_snapshot(cls, volume_id=1, **kwargs):
-        """Wrapper utility that returns a test snapshot."""
+    @tracing.traced(resource_kind='cinder.snapshot')
+    def create_snapshot(cls, volume_id=1, wait_until='available', **kwargs):
+        """Wrapper utility that returns a test snapshot.
+
+           :param wait_until: wait till snapshot status, None means no wait.
+        """
         if 'name' not in kwargs:
             name = data_utils.rand_name(cls.__name__ + '-Snapshot')
             kwargs['name'] = name
@@ -116,14 +152,17 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
         snapshot = cls.snapshots_client.create_snapshot(
             volume_id=volume_id, **kwargs)['snapshot']
         cls.addClassResourceCleanup(
-            cls.snapshots_client.wait_for_resource_deletion, snapshot['id'])
+            volume_waiters.wait_for_resource_deletion, cls.snapshots_client,
+            snapshot['id'])
         cls.addClassResourceCleanup(test_utils.call_and_ignore_notfound_exc,
                                     cls.snapshots_client.delete_snapshot,
                                     snapshot['id'])
-        waiters.wait_for_volume_resource_status(cls.snapshots_client,
-                                                snapshot['id'], 'available')
+        if wait_until:
+            volume_waiters.wait_for_volume_resource_status(
+                cls.snapshots_client, snapshot['id'], wait_until)
         return snapshot
 
+    @tracing.traced(resource_kind='cinder.backup')
     def create_backup(self, volume_id, backup_client=None, **kwargs):
         """Wrapper utility that returns a test backup."""
         if backup_client is None:
@@ -134,13 +173,15 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
 
         backup = backup_client.create_backup(
             volume_id=volume_id, **kwargs)['backup']
-        self.addCleanup(backup_client.wait_for_resource_deletion, backup['id'])
+        self.addCleanup(volume_waiters.wait_for_resource_deletion,
+                        backup_client, backup['id'])
         self.addCleanup(test_utils.call_and_ignore_notfound_exc,
                         backup_client.delete_backup, backup['id'])
-        waiters.wait_for_volume_resource_status(backup_client, backup['id'],
-                                                'available')
+        volume_waiters.wait_for_volume_resource_status(
+            backup_client, backup['id'], 'available')
         return backup
 
+    @tracing.traced(resource_kind='nova.server')
     def create_server(self, wait_until='ACTIVE', **kwargs):
         name = kwargs.pop(
             'name',
@@ -168,6 +209,7 @@ class BaseVolumeTest(api_version_utils.BaseMicroversionTest,
         return body
 
     @classmethod
+    @tracing.traced(resource_kind='glance.image')
     def create_image_with_data(cls, **kwargs):
         # we do this as a class method so we can use the
         # addClassResourceCleanup functionality of tempest.test.BaseTestCase
@@ -196,18 +238,18 @@ class BaseVolumeAdminTest(BaseVolumeTest):
 
     credentials = ['primary', 'admin']
 
-    @classmethod
-    def setup_clients(cls):
-        super(BaseVolumeAdminTest, cls).setup_clients()
-
-        cls.admin_volume_types_client = cls.os_admin.volume_types_client_latest
-        cls.admin_backups_client = cls.os_admin.backups_client_latest
-        cls.admin_volume_client = cls.os_admin.volumes_client_latest
-        cls.admin_consistencygroups_client = (
-            cls.os_admin.consistencygroups_v3.ConsistencyGroupsClient()
-        )
+    admin_volume_types_client = _LazyClient(
+        lambda cls: cls.os_admin.volume_types_client_latest)
+    admin_backups_client = _LazyClient(
+        lambda cls: cls.os_admin.backups_client_latest)
+    admin_volume_client = _LazyClient(
+        lambda cls: cls.os_admin.volumes_client_latest)
+    admin_consistencygroups_client = _LazyClient(
+        lambda cls: (
+            cls.os_admin.consistencygroups_v3.ConsistencyGroupsClient()))
 
     @classmethod
+    @tracing.traced(resource_kind='cinder.volume_type')
     def create_volume_type(cls, name=None, **kwargs):
         """Create a test volume-type"""
 
@@ -13,17 +13,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
 
+from oslo_log import log
 from tempest.common import utils
-from tempest.common import waiters
 from tempest import config
 from tempest.lib import decorators
 import testtools
+from testtools import content
 
 from cinder_tempest_plugin.api.volume import base
+from cinder_tempest_plugin.common import dependency_graph
+from cinder_tempest_plugin.common import waiters as volume_waiters
 
 CONF = config.CONF
 
+LOG = log.getLogger(__name__)
+
 
 class VolumeDependencyTests(base.BaseVolumeTest):
     min_microversion = '3.40'
@@ -44,7 +50,8 @@ class VolumeDependencyTests(base.BaseVolumeTest):
         cloned_volume = self.create_volume(**kwargs)
         self.assertEqual(source_volume['id'], cloned_volume['source_volid'])
         self.volumes_client.delete_volume(source_volume['id'])
-        self.volumes_client.wait_for_resource_deletion(source_volume['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, source_volume['id'])
 
     @decorators.idempotent_id('900d8ea5-2afd-4fe5-a0c3-fab4744f0d40')
     def test_delete_source_snapshot(self):
@@ -63,20 +70,23 @@ class VolumeDependencyTests(base.BaseVolumeTest):
                          snapshot_source_volume['id'])
 
         self.snapshots_client.delete_snapshot(snapshot_source_volume['id'])
-        self.snapshots_client.wait_for_resource_deletion(
-            snapshot_source_volume['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.snapshots_client, snapshot_source_volume['id'])
         self.volumes_client.delete_volume(source_volume['id'])
-        self.volumes_client.wait_for_resource_deletion(source_volume['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, source_volume['id'])
 
     def _delete_vol_and_wait(self, vol_id):
         self.volumes_client.delete_volume(vol_id)
 
-        self.volumes_client.wait_for_resource_deletion(vol_id)
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, vol_id)
 
     def _delete_snap_and_wait(self, snap_id):
         self.snapshots_client.delete_snapshot(snap_id)
 
-        self.snapshots_client.wait_for_resource_deletion(snap_id)
+        volume_waiters.wait_for_resource_deletion(
+            self.snapshots_client, snap_id)
 
     @decorators.idempotent_id('f8278e5c-50ff-4a1d-8670-3ca0866d411a')
     def test_delete_dep_chain(self):
@@ -166,12 +176,12 @@ class VolumeImageDependencyTests(base.BaseVolumeTest):
                              '7a9fba78-2e4b-42b1-9898-bb4a60685320'),
                     'imageRef': image['id']}
         volume1 = self.create_volume(**vol_args)
-        waiters.wait_for_volume_resource_status(self.volumes_client,
-                                                volume1['id'],
-                                                'available')
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume1['id'], 'available')
 
         self.volumes_client.delete_volume(volume1['id'])
-        self.volumes_client.wait_for_resource_deletion(volume1['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, volume1['id'])
 
         self.del_image(image['id'])
 
@@ -195,20 +205,19 @@ class VolumeImageDependencyTests(base.BaseVolumeTest):
                              '0e20bd6e-440f-41d8-9b5d-fc047ac00423'),
                     'imageRef': image['id']}
         volume1 = self.create_volume(**vol_args)
-        waiters.wait_for_volume_resource_status(self.volumes_client,
-                                                volume1['id'],
-                                                'available')
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume1['id'], 'available')
 
         vol2_args = {'name': ('volume2-for-test-'
                               '0e20bd6e-440f-41d8-9b5d-fc047ac00423'),
                      'source_volid': volume1['id']}
         volume2 = self.create_volume(**vol2_args)
-        waiters.wait_for_volume_resource_status(self.volumes_client,
-                                                volume2['id'],
-                                                'available')
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume2['id'], 'available')
 
         self.volumes_client.delete_volume(volume1['id'])
-        self.volumes_client.wait_for_resource_deletion(volume1['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, volume1['id'])
 
         self.del_image(image['id'])
 
@@ -232,9 +241,8 @@ class VolumeImageDependencyTests(base.BaseVolumeTest):
                              'e6050452-06bd-4c7f-9912-45178c83e379'),
                     'imageRef': image['id']}
         volume1 = self.create_volume(**vol_args)
-        waiters.wait_for_volume_resource_status(self.volumes_client,
-                                                volume1['id'],
-                                                'available')
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume1['id'], 'available')
 
         snapshot1 = self.create_snapshot(volume1['id'])
 
@@ -242,17 +250,130 @@ class VolumeImageDependencyTests(base.BaseVolumeTest):
                               'e6050452-06bd-4c7f-9912-45178c83e379'),
                      'snapshot_id': snapshot1['id']}
         volume2 = self.create_volume(**vol2_args)
-        waiters.wait_for_volume_resource_status(self.volumes_client,
-                                                volume2['id'],
-                                                'available')
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume2['id'], 'available')
 
         self.snapshots_client.delete_snapshot(snapshot1['id'])
-        self.snapshots_client.wait_for_resource_deletion(snapshot1['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.snapshots_client, snapshot1['id'])
 
         self.volumes_client.delete_volume(volume2['id'])
-        self.volumes_client.wait_for_resource_deletion(volume2['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, volume2['id'])
 
         self.del_image(image['id'])
 
         self.volumes_client.delete_volume(volume1['id'])
-        self.volumes_client.wait_for_resource_deletion(volume1['id'])
+        volume_waiters.wait_for_resource_deletion(
+            self.volumes_client, volume1['id'])
+
+
+class VolumeDependencyScaleTests(base.BaseVolumeTest):
+    """Deep volume dependency chains, timed level by level.
+
+    `[volume] dependency_scale_fanout` chains of
+    `[volume] dependency_scale_depth` levels are grown from one root
+    volume. Every level adds one volume per chain, created from a snapshot
+    of the previous volume or cloned from it. The resources of a level are
+    created at once, then the chains are deleted by the dependency graph
+    planner, one round per level of the graph from the deepest one up. The
+    time taken by every creation level and deletion round, and their least
+    squares slope over the depth, is reported in a
+    'dependency-scale-<link>' detail, which shows how the backend copes
+    with long clone chains.
+    """
+
+    min_microversion = '3.40'
+
+    @classmethod
+    def skip_checks(cls):
+        super(VolumeDependencyScaleTests, cls).skip_checks()
+        if not CONF.volume_feature_enabled.dependency_scale_tests:
+            raise cls.skipException(
+                "Volume dependency scale tests are disabled.")
+
+    @staticmethod
+    def _slope(values):
+        """Least squares slope of values over their index"""
+        count = len(values)
+        if count < 2:
+            return 0.0
+        mean_x = (count - 1) / 2.0
+        mean_y = sum(values) / count
+        return (sum((x - mean_x) * (y - mean_y)
+                    for x, y in enumerate(values)) /
+                sum((x - mean_x) ** 2 for x in range(count)))
+
+    def _create_level(self, parents, link):
+        """Create one child of each parent volume at once
+
+        :returns: the nodes of the level, {'volume': id, 'snapshot': id}
+            dicts where 'snapshot' is the snapshot the volume was created
+            from, None for clones.
+        """
+        if link == 'snapshot':
+            snapshots = [self.create_snapshot(parent, wait_until=None)['id']
+                         for parent in parents]
+            for snapshot_id in snapshots:
+                volume_waiters.wait_for_volume_resource_status(
+                    self.snapshots_client, snapshot_id, 'available')
+            volumes = [self.create_volume(snapshot_id=snapshot_id,
+                                          wait_until=None)['id']
+                       for snapshot_id in snapshots]
+        else:
+            snapshots = [None] * len(parents)
+            volumes = [self.create_volume(source_volid=parent,
+                                          wait_until=None)['id']
+                       for parent in parents]
+        for volume_id in volumes:
+            volume_waiters.wait_for_volume_resource_status(
+                self.volumes_client, volume_id, 'available')
+        return [{'volume': volume_id, 'snapshot': snapshot_id}
+                for volume_id, snapshot_id in zip(volumes, snapshots)]
+
+    def _run_chains(self, link):
+        depth = CONF.volume.dependency_scale_depth
+        fanout = CONF.volume.dependency_scale_fanout
+        root = self.create_volume()['id']
+        levels = []
+        create_times = []
+        parents = [root] * fanout
+        for __ in range(depth):
+            start = time.monotonic()
+            nodes = self._create_level(parents, link)
+            create_times.append(time.monotonic() - start)
+            levels.append(nodes)
+            parents = [node['volume'] for node in nodes]
+
+        rounds = dependency_graph.delete_all(
+            self.volumes_client, self.snapshots_client,
+            volume_ids=[root] + [node['volume'] for nodes in levels
+                                 for node in nodes],
+            snapshot_ids=[node['snapshot'] for nodes in levels
+                          for node in nodes if node['snapshot']])
+        delete_times = [deletion['seconds'] for deletion in rounds]
+
+        report = {
+            'link': link,
+            'depth': depth,
+            'fanout': fanout,
+            'create_levels': create_times,
+            'delete_rounds': rounds,
+            'create_slope': self._slope(create_times),
+            'delete_slope': self._slope(delete_times),
+        }
+        LOG.info('Dependency chains of %d x %d %s levels: create slope '
+                 '%.3f s/level, delete slope %.3f s/round', fanout, depth,
+                 link, report['create_slope'], report['delete_slope'])
+        self.addDetail('dependency-scale-%s' % link,
+                       content.json_content(report))
+
+    @decorators.idempotent_id('b6d3e8f1-7c2a-4e59-9a14-3f5c8d2e7b60')
+    def test_dependency_scale_snapshot_chain(self):
+        """Chains where every volume is created from a snapshot."""
+        self._run_chains('snapshot')
+
+    @decorators.idempotent_id('d91a4c27-5e8b-4f36-b2d0-6a7e1c9f4b83')
+    def test_dependency_scale_clone_chain(self):
+        """Chains where every volume is a clone of the previous one."""
+        self._run_chains('clone')
@@ -0,0 +1,89 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import collections
+
+from oslo_serialization import jsonutils as json
+
+PERCENTILES = (50, 90, 99)
+
+# Metrics compared against the baseline, with True when higher is better
+COMPARED_METRICS = {'p50': False, 'p90': False, 'p99': False,
+                    'throughput': True}
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    rank = max(1, int(round(percent / 100.0 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(samples, wall_time):
+    """Summarize the latencies of a workload run
+
+    :param samples: (operation, latency in seconds) tuples.
+    :param wall_time: duration of the whole run, in seconds.
+    :returns: a dict keyed by operation holding its count, throughput in
+        operations per second and latency mean, max and percentiles.
+    """
+    latencies = collections.defaultdict(list)
+    for operation, latency in samples:
+        latencies[operation].append(latency)
+    summary = {}
+    for operation, values in sorted(latencies.items()):
+        entry = {'count': len(values),
+                 'throughput': len(values) / wall_time if wall_time else 0.0,
+                 'mean': sum(values) / len(values),
+                 'max': max(values)}
+        for percent in PERCENTILES:
+            entry['p%s' % percent] = percentile(values, percent)
+        summary[operation] = entry
+    return summary
+
+
+def load_baseline(path):
+    with open(path) as baseline:
+        return json.load(baseline)
+
+
+def compare(summary, baseline, tolerance):
+    """Return the regressions of a summary over its baseline
+
+    :param summary: the summary of a workload, as returned by summarize.
+    :param baseline: the reference summary of the same workload.
+        Operations may set their own 'tolerance'.
+    :param tolerance: allowed relative regression of every metric.
+    :returns: a list of messages, one per regressed metric.
+    """
+    regressions = []
+    for operation, reference in sorted(baseline.items()):
+        if operation not in summary:
+            continue
+        allowed = reference.get('tolerance', tolerance)
+        for metric, higher_is_better in sorted(COMPARED_METRICS.items()):
+            if metric not in reference:
+                continue
+            expected = reference[metric]
+            actual = summary[operation][metric]
+            if higher_is_better:
+                regressed = actual < expected * (1 - allowed)
+            else:
+                regressed = actual > expected * (1 + allowed)
+            if regressed:
+                regressions.append(
+                    '%s %s: %.3f, baseline %.3f (tolerance %d%%)' %
+                    (operation, metric, actual, expected, allowed * 100))
+    return regressions
@@ -0,0 +1,256 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import os
+import time
+
+from oslo_log import log
+from oslo_serialization import jsonutils as json
+from tempest.common import utils
+from tempest import config
+from tempest.lib.common.utils import data_utils
+from tempest.lib.common.utils import test_utils
+from tempest.lib import decorators
+from testtools import content
+
+from cinder_tempest_plugin.api.volume import base
+from cinder_tempest_plugin.benchmark import stats
+from cinder_tempest_plugin.common import concurrency
+from cinder_tempest_plugin.common import waiters as volume_waiters
+
+CONF = config.CONF
+
+LOG = log.getLogger(__name__)
+
+
+class VolumeBenchmarkTest(base.BaseVolumeTest):
+    """Standard Cinder workloads, timed and compared to a baseline
+
+    Every workload runs `[volume] benchmark_concurrency` workers, each doing
+    `[volume] benchmark_iterations` operations in a row. Only the timed
+    operations are part of the results; the workers set up and delete what
+    they need on their own, as their processes cannot register cleanups.
+    """
+
+    # Needed by the revert workload
+    min_microversion = '3.40'
+
+    @classmethod
+    def skip_checks(cls):
+        super(VolumeBenchmarkTest, cls).skip_checks()
+        if not CONF.volume_feature_enabled.benchmark_tests:
+            raise cls.skipException("Benchmark tests are disabled.")
+
+    @classmethod
+    def resource_setup(cls):
+        super(VolumeBenchmarkTest, cls).resource_setup()
+        cls.baseline = {}
+        if CONF.volume.benchmark_baseline:
+            cls.baseline = stats.load_baseline(CONF.volume.benchmark_baseline)
+
+    def _timed(self, samples, operation, func, *args, **kwargs):
+        start = time.monotonic()
+        result = func(*args, **kwargs)
+        samples.append((operation, time.monotonic() - start))
+        return result
+
+    def _new_volume(self, **kwargs):
+        volume = self.volumes_client.create_volume(
+            size=kwargs.pop('size', CONF.volume.volume_size),
+            name=data_utils.rand_name(self.__class__.__name__ + '-Volume'),
+            **kwargs)['volume']
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume['id'], 'available')
+        return volume['id']
+
+    def _delete(self, client, delete, resource_id):
+        test_utils.call_and_ignore_notfound_exc(delete, resource_id)
+        volume_waiters.wait_for_resource_deletion(client, resource_id)
+
+    def _delete_volume(self, volume_id):
+        self._delete(self.volumes_client, self.volumes_client.delete_volume,
+                     volume_id)
+
+    def _cleanup(self, client, delete, resource_id):
+        """Delete what a failed worker left, without hiding its error"""
+        try:
+            self._delete(client, delete, resource_id)
+        except Exception:
+            LOG.exception('Could not delete %s %s left by a benchmark worker',
+                          client.resource_type, resource_id)
+
+    def _run_workload(self, name, worker, **kwargs):
+        """Run a workload, report its results and check its baseline"""
+        def run_worker(index, samples, **kwargs):
+            for __ in range(CONF.volume.benchmark_iterations):
+                worker(index, samples, **kwargs)
+
+        start = time.monotonic()
+        samples = concurrency.run_concurrent_tasks(
+            run_worker, resource_count=CONF.volume.benchmark_concurrency,
+            **kwargs)
+        summary = stats.summarize(samples, time.monotonic() - start)
+        LOG.info('Benchmark %s: %s', name, summary)
+        self.addDetail('benchmark-%s' % name, content.json_content(summary))
+        if CONF.volume.benchmark_results_dir:
+            path = os.path.join(CONF.volume.benchmark_results_dir,
+                                '%s.json' % name)
+            with open(path, 'w') as results:
+                json.dump(summary, results, indent=2, sort_keys=True)
+
+        regressions = stats.compare(summary, self.baseline.get(name, {}),
+                                    CONF.volume.benchmark_tolerance)
+        if regressions:
+            self.fail('Benchmark %s regressed:\n%s' %
+                      (name, '\n'.join(regressions)))
+
+    def _create_delete(self, index, samples):
+        volume_id = self._timed(samples, 'create', self._new_volume)
+        self._timed(samples, 'delete', self._delete_volume, volume_id)
+
+    def _clone(self, index, samples, source_volid):
+        volume_id = self._timed(samples, 'clone', self._new_volume,
+                                source_volid=source_volid)
+        self._delete_volume(volume_id)
+
+    def _snapshot(self, index, samples, volume_id):
+        def create():
+            snapshot = self.snapshots_client.create_snapshot(
+                volume_id=volume_id,
+                name=data_utils.rand_name(
+                    self.__class__.__name__ + '-Snapshot'))['snapshot']
+            volume_waiters.wait_for_volume_resource_status(
+                self.snapshots_client, snapshot['id'], 'available')
+            return snapshot['id']
+
+        snapshot_id = self._timed(samples, 'create', create)
+        self._timed(samples, 'delete', self._delete, self.snapshots_client,
+                    self.snapshots_client.delete_snapshot, snapshot_id)
+
+    def _backup_restore(self, index, samples, volume_ids):
+        # Every worker backs up its own volume, Cinder refuses to back up
+        # a volume already being backed up
+        volume_id = volume_ids[index]
+        created = {}
+
+        def backup():
+            created['backup'] = self.backups_client.create_backup(
+                volume_id=volume_id,
+                name=data_utils.rand_name(
+                    self.__class__.__name__ + '-Backup'))['backup']['id']
+            volume_waiters.wait_for_volume_resource_status(
+                self.backups_client, created['backup'], 'available')
+
+        def restore():
+            created['volume'] = self.backups_client.restore_backup(
+                created['backup'])['restore']['volume_id']
+            volume_waiters.wait_for_volume_resource_status(
+                self.volumes_client, created['volume'], 'available')
+            volume_waiters.wait_for_volume_resource_status(
+                self.backups_client, created['backup'], 'available')
+
+        try:
+            self._timed(samples, 'backup', backup)
+            self._timed(samples, 'restore', restore)
+        finally:
+            if 'volume' in created:
+                self._cleanup(self.volumes_client,
+                              self.volumes_client.delete_volume,
+                              created['volume'])
+            if 'backup' in created:
+                self._cleanup(self.backups_client,
+                              self.backups_client.delete_backup,
+                              created['backup'])
+
+    def _attach_detach(self, index, samples, server_id):
+        servers_client = self.os_primary.servers_client
+        volume_id = self._new_volume()
+
+        def attach():
+            servers_client.attach_volume(server_id, volumeId=volume_id)
+            volume_waiters.wait_for_volume_resource_status(
+                self.volumes_client, volume_id, 'in-use')
+
+        def detach():
+            servers_client.detach_volume(server_id, volume_id)
+            volume_waiters.wait_for_volume_resource_status(
+                self.volumes_client, volume_id, 'available')
+
+        try:
+            self._timed(samples, 'attach', attach)
+            self._timed(samples, 'detach', detach)
+        finally:
+            self._delete_volume(volume_id)
+
+    def _revert(self, index, samples):
+        volume_id = self._new_volume()
+        snapshot = self.snapshots_client.create_snapshot(
+            volume_id=volume_id)['snapshot']
+        try:
+            volume_waiters.wait_for_volume_resource_status(
+                self.snapshots_client, snapshot['id'], 'available')
+
+            def revert():
+                self.volume_revert_client.revert_to_snapshot(
+                    {'id': volume_id}, snapshot['id'])
+                volume_waiters.wait_for_volume_resource_status(
+                    self.volumes_client, volume_id, 'available')
+
+            self._timed(samples, 'revert', revert)
+        finally:
+            self._delete(self.snapshots_client,
+                         self.snapshots_client.delete_snapshot,
+                         snapshot['id'])
+            self._delete_volume(volume_id)
+
+    @decorators.idempotent_id('0d4c6b7e-52a4-4f0e-9a57-8f7d2c6a1e31')
+    def test_benchmark_create_delete(self):
+        self._run_workload('create_delete', self._create_delete)
+
+    @decorators.idempotent_id('5b1f0c38-8a4e-4d0b-b0c6-2e9f4b7d6a52')
+    def test_benchmark_clone(self):
+        source = self.create_volume()
+        self._run_workload('clone', self._clone, source_volid=source['id'])
+
+    @decorators.idempotent_id('a2e7d9c4-1f36-4b58-9e0a-7c3b5d8f2e14')
+    def test_benchmark_snapshot(self):
+        volume = self.create_volume()
+        self._run_workload('snapshot', self._snapshot, volume_id=volume['id'])
+
+    @decorators.idempotent_id('c8f3a1d6-4e2b-4a97-b5d0-9e6c2f7a3b85')
+    def test_benchmark_backup_restore(self):
+        if not CONF.volume_feature_enabled.backup:
+            raise self.skipException("Cinder backup feature disabled")
+        volume_ids = [
+            self.create_volume(wait_until=None)['id']
+            for __ in range(CONF.volume.benchmark_concurrency)]
+        for volume_id in volume_ids:
+            volume_waiters.wait_for_volume_resource_status(
+                self.volumes_client, volume_id, 'available')
+        self._run_workload('backup_restore', self._backup_restore,
+                           volume_ids=volume_ids)
+
+    @decorators.idempotent_id('e4b9c2f7-6d1a-4c38-8f5e-1a7d3b9c6e20')
+    @utils.services('compute')
+    def test_benchmark_attach_detach(self):
+        server = self.create_server()
+        self._run_workload('attach_detach', self._attach_detach,
+                           server_id=server['id'])
+
+    @decorators.idempotent_id('7f2d5a8c-3b9e-4e61-a4c7-6d0b8e2f5a93')
+    def test_benchmark_revert(self):
+        if not CONF.volume_feature_enabled.volume_revert:
+            raise self.skipException("Cinder volume revert feature disabled")
+        self._run_workload('revert', self._revert)
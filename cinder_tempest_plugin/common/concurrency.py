@@ -17,35 +17,53 @@ import multiprocessing
 
 from tempest import config
 
+from cinder_tempest_plugin.common import profiling
+from cinder_tempest_plugin.common import tracing
+
 CONF = config.CONF
 
 
-def run_concurrent_tasks(target, **kwargs):
-    """Run a target function concurrently using multiprocessing."""
+def run_concurrent_tasks(target, resource_count=None, **kwargs):
+    """Run a target function concurrently using multiprocessing.
+
+    :param target: callable run in every worker as
+        target(index, resource_ids, **kwargs).
+    :param resource_count: number of workers, defaults to
+        `[volume] concurrent_resource_count`.
+    """
     manager = multiprocessing.Manager()
     resource_ids = manager.list()
     # To capture exceptions
     errors = manager.list()
-    resource_count = CONF.volume.concurrent_resource_count
+    if resource_count is None:
+        resource_count = CONF.volume.concurrent_resource_count
+    name = getattr(target, '__name__', 'target')
 
-    def wrapped_target(index, resource_ids, **kwargs):
+    def wrapped_target(index, resource_ids, trace_context, **kwargs):
         try:
-            target(index, resource_ids, **kwargs)
+            with tracing.attach(trace_context), \
+                    tracing.span('%s-worker' % name, **{
+                        'cinder.worker.index': index}), \
+                    profiling.profile('%s-worker-%d' % (name, index)):
+                target(index, resource_ids, **kwargs)
         except Exception as e:
             errors.append(f"Worker {index} failed: {str(e)}")
 
-    processes = []
-    for i in range(resource_count):
-        p = multiprocessing.Process(
-            target=wrapped_target,
-            args=(i, resource_ids),
-            kwargs=kwargs
-        )
-        processes.append(p)
-        p.start()
-
-    for p in processes:
-        p.join()
+    with tracing.span('run_concurrent_tasks', **{
+            'cinder.concurrency.target': name,
+            'cinder.concurrency.workers': resource_count}):
+        processes = []
+        for i in range(resource_count):
+            p = multiprocessing.Process(
+                target=wrapped_target,
+                args=(i, resource_ids, tracing.current_context()),
+                kwargs=kwargs
+            )
+            processes.append(p)
+            p.start()
+
+        for p in processes:
+            p.join()
 
     if errors:
         error_msg = "\n".join(errors)
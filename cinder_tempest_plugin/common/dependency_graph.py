@@ -0,0 +1,177 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Deletion of volume, snapshot and backup dependency graphs
+
+discover() finds which of a set of resources must be deleted before the
+others: clones before their source volume, volumes before the snapshot
+they were created from, snapshots before their volume and incremental
+backups before their parent. plan() sorts them into levels which only
+depend on the previous ones, and delete() deletes every level at once,
+waiting for it with one paginated list per resource type and poll. A
+graph is then torn down in as many rounds as it is deep rather than one
+per resource.
+"""
+
+import collections
+from concurrent import futures
+import time
+
+from tempest import config
+from tempest.lib.common.utils import test_utils
+
+from cinder_tempest_plugin.common import tracing
+from cinder_tempest_plugin.common import waiters as volume_waiters
+
+CONF = config.CONF
+
+VOLUME = 'volume'
+SNAPSHOT = 'snapshot'
+BACKUP = 'backup'
+
+
+def _list(client, kind, ids):
+    if not ids or client is None:
+        return []
+    return [resource for resource in
+            volume_waiters.list_resources(client, kind)
+            if resource['id'] in ids]
+
+
+def _backup_parents(backups):
+    """Map the incremental backups to their parent"""
+    parents = {}
+    by_volume = collections.defaultdict(list)
+    for backup in backups:
+        if 'parent_id' in backup:
+            parents[backup['id']] = backup['parent_id']
+        else:
+            by_volume[backup['volume_id']].append(backup)
+    # Without parent_id in the API, assume an incremental backup is based
+    # on the previous backup of its volume
+    for chain in by_volume.values():
+        chain.sort(key=lambda backup: backup['created_at'])
+        for previous, backup in zip(chain, chain[1:]):
+            if backup.get('is_incremental'):
+                parents[backup['id']] = previous['id']
+    return parents
+
+
+def discover(volumes_client, snapshots_client, backups_client=None,
+             volume_ids=(), snapshot_ids=(), backup_ids=()):
+    """Find the deletion dependencies among some resources
+
+    Relations to resources outside of the given ones, or already deleted,
+    are ignored.
+
+    :returns: a dict mapping every (kind, id) node to the set of nodes
+        that must be deleted before it.
+    """
+    volumes = _list(volumes_client, VOLUME, set(volume_ids))
+    snapshots = _list(snapshots_client, SNAPSHOT, set(snapshot_ids))
+    backups = _list(backups_client, BACKUP, set(backup_ids))
+    blockers = {}
+    for kind, resources in ((VOLUME, volumes), (SNAPSHOT, snapshots),
+                            (BACKUP, backups)):
+        for resource in resources:
+            blockers[(kind, resource['id'])] = set()
+
+    def depends(node, kind, resource_id):
+        if (kind, resource_id) in blockers:
+            blockers[(kind, resource_id)].add(node)
+
+    for volume in volumes:
+        node = (VOLUME, volume['id'])
+        depends(node, VOLUME, volume.get('source_volid'))
+        depends(node, SNAPSHOT, volume.get('snapshot_id'))
+    for snapshot in snapshots:
+        depends((SNAPSHOT, snapshot['id']), VOLUME, snapshot['volume_id'])
+    for backup_id, parent_id in _backup_parents(backups).items():
+        depends((BACKUP, backup_id), BACKUP, parent_id)
+    return blockers
+
+
+def plan(blockers):
+    """Sort a dependency graph into deletion levels
+
+    :param blockers: a graph as returned by discover().
+    :returns: a list of levels, lists of (kind, id) nodes to delete once
+        the previous levels are deleted.
+    :raises ValueError: if the graph has a cycle.
+    """
+    remaining = {node: set(before) for node, before in blockers.items()}
+    levels = []
+    while remaining:
+        level = sorted(node for node, before in remaining.items()
+                       if not before & remaining.keys())
+        if not level:
+            raise ValueError('Dependency cycle among %s' %
+                             sorted(remaining))
+        for node in level:
+            del remaining[node]
+        levels.append(level)
+    return levels
+
+
+def _delete_node(clients, node):
+    kind, resource_id = node
+    test_utils.call_and_ignore_notfound_exc(
+        getattr(clients[kind], 'delete_' + kind), resource_id)
+
+
+def delete(levels, clients):
+    """Delete planned levels, each one at once
+
+    :param levels: deletion levels as returned by plan().
+    :param clients: dict of the client deleting every kind of node.
+    :returns: a list of {'resources', 'seconds'} dicts, one per level.
+    """
+    rounds = []
+    for level in levels:
+        start = time.monotonic()
+        with tracing.span('delete_level', **{
+                'cinder.resource_count': len(level)}):
+            with futures.ThreadPoolExecutor(
+                    max(1, min(len(level),
+                               CONF.volume.concurrent_resource_count))
+            ) as executor:
+                deletions = [executor.submit(tracing.wrap(_delete_node),
+                                             clients, node)
+                             for node in level]
+                for deletion in deletions:
+                    deletion.result()
+            pending = collections.defaultdict(set)
+            for kind, resource_id in level:
+                pending[clients[kind]].add(resource_id)
+            volume_waiters.wait_for_resources_deletion(pending)
+        rounds.append({'resources': len(level),
+                       'seconds': time.monotonic() - start})
+    return rounds
+
+
+def delete_all(volumes_client, snapshots_client, backups_client=None,
+               volume_ids=(), snapshot_ids=(), backup_ids=()):
+    """Discover, plan and delete a dependency graph
+
+    :returns: the rounds returned by delete().
+    :raises ValueError: if backup_ids are given without a backups_client.
+    """
+    if backup_ids and backups_client is None:
+        raise ValueError('Deleting backups requires a backups_client')
+    blockers = discover(volumes_client, snapshots_client, backups_client,
+                        volume_ids, snapshot_ids, backup_ids)
+    return delete(plan(blockers), {VOLUME: volumes_client,
+                                   SNAPSHOT: snapshots_client,
+                                   BACKUP: backups_client})
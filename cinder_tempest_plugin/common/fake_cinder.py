@@ -0,0 +1,833 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""In-process stand-in for the Keystone and Cinder APIs
+
+The fake implements enough of the Identity v3 token API and of the Block
+Storage v3 API (volumes, snapshots, backups, consistency groups and volume
+revert) for the tempest and plugin service clients to run against it, so
+that the waiters, the concurrency helpers and the clients can be exercised
+and load tested without a cloud.
+
+Resources move through their transient states after a configurable delay,
+requests can be slowed down following a latency distribution, and faults
+can be injected both on requests and on state transitions.
+
+Run it standalone with:
+
+    python -m cinder_tempest_plugin.common.fake_cinder --port 8776
+
+and point tempest at http://127.0.0.1:8776/identity/v3.
+"""
+
+import argparse
+import datetime
+from http import server as http_server
+import random
+import re
+import threading
+import time
+import uuid
+
+from oslo_serialization import jsonutils as json
+
+# Cinder error body keys by HTTP status
+_FAULT_NAMES = {
+    400: 'badRequest',
+    403: 'forbidden',
+    404: 'itemNotFound',
+    409: 'conflict',
+    413: 'overLimit',
+    500: 'computeFault',
+    503: 'serviceUnavailable',
+}
+
+
+def parse_distribution(spec):
+    """Return a function sampling durations in seconds from a spec
+
+    :param spec: one of 'constant:<s>', 'uniform:<min>:<max>',
+        'normal:<mean>:<stddev>', 'lognormal:<mu>:<sigma>' or
+        'exponential:<mean>'. A bare number is a constant.
+    :returns: a callable taking a random.Random and returning a duration,
+        never negative.
+    """
+    name, __, args = str(spec).partition(':')
+    try:
+        if not args:
+            value = float(name)
+            return lambda rng: value
+        params = [float(arg) for arg in args.split(':')]
+    except ValueError:
+        raise ValueError('Invalid distribution %r' % spec)
+    samplers = {
+        'constant': lambda rng, value: value,
+        'uniform': lambda rng, low, high: rng.uniform(low, high),
+        'normal': lambda rng, mean, stddev: rng.gauss(mean, stddev),
+        'lognormal': lambda rng, mu, sigma: rng.lognormvariate(mu, sigma),
+        'exponential': lambda rng, mean: rng.expovariate(1.0 / mean),
+    }
+    if name not in samplers:
+        raise ValueError('Unknown distribution %r' % name)
+    sampler = samplers[name]
+    return lambda rng: max(0.0, sampler(rng, *params))
+
+
+class Fault(object):
+    """Error returned instead of handling matching requests
+
+    :param status: HTTP status to answer with.
+    :param probability: chance for a matching request to fail.
+    :param method: HTTP method to match, any when None.
+    :param path: regular expression searched in the request path, any
+        when None.
+    """
+
+    def __init__(self, status, probability=1.0, method=None, path=None):
+        self.status = int(status)
+        self.probability = float(probability)
+        self.method = method.upper() if method else None
+        self.path = re.compile(path) if path else None
+
+    @classmethod
+    def from_string(cls, spec):
+        """Parse a '<status>[:<probability>[:<method>[:<path regex>]]]' spec"""
+        parts = spec.split(':', 3)
+        parts += [None] * (4 - len(parts))
+        return cls(parts[0], parts[1] or 1.0, parts[2] or None,
+                   parts[3] or None)
+
+    def matches(self, method, path):
+        return ((self.method is None or self.method == method) and
+                (self.path is None or self.path.search(path) is not None))
+
+
+class _HTTPError(Exception):
+
+    def __init__(self, status, message):
+        super(_HTTPError, self).__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _now():
+    return _utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')
+
+
+# Fields of the detailed views, which pass the tempest response schemas of
+# every microversion
+_VOLUME_FIELDS = (
+    'attachments', 'availability_zone', 'bootable', 'consistencygroup_id',
+    'created_at', 'description', 'encrypted', 'id', 'metadata',
+    'multiattach', 'name', 'replication_status', 'size', 'snapshot_id',
+    'source_volid', 'status', 'updated_at', 'user_id', 'volume_type')
+_SNAPSHOT_FIELDS = (
+    'created_at', 'description', 'id', 'metadata', 'name', 'size', 'status',
+    'updated_at', 'volume_id')
+_BACKUP_FIELDS = (
+    'availability_zone', 'container', 'created_at', 'data_timestamp',
+    'description', 'fail_reason', 'id', 'is_incremental', 'name',
+    'object_count', 'size', 'snapshot_id', 'status', 'updated_at',
+    'volume_id')
+
+
+class FakeCinder(object):
+    """State and behaviour of the fake cloud
+
+    :param transition_delay: distribution spec of the time a resource
+        spends in a transient state such as 'creating' or 'deleting'.
+    :param latency: distribution spec of the time added to every request.
+    :param faults: Fault instances checked on every request.
+    :param transition_error_rate: chance for a resource to end up in
+        'error' instead of its target state.
+    :param seed: seed of the random generator, for repeatable runs.
+    """
+
+    def __init__(self, transition_delay='constant:0', latency='constant:0',
+                 faults=(), transition_error_rate=0.0, seed=None):
+        self.transition_delay = parse_distribution(transition_delay)
+        self.latency = parse_distribution(latency)
+        self.faults = list(faults)
+        self.transition_error_rate = transition_error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.resources = {kind: {} for kind in (
+            'volumes', 'snapshots', 'backups', 'consistencygroups',
+            'cgsnapshots')}
+        self.request_count = 0
+        # Set by FakeCinderServer once bound, for the resource links
+        self.base_url = 'http://localhost'
+        self.user_id = str(uuid.uuid4())
+        # Project of the request being handled
+        self.project_id = None
+
+    # Resource life cycle
+
+    def _new(self, kind, record, final_status='available',
+             initial_status='creating'):
+        record.update(id=str(uuid.uuid4()), created_at=_now(),
+                      updated_at=None, status=initial_status,
+                      project_id=self.project_id, user_id=self.user_id)
+        self._transition(record, final_status)
+        self.resources[kind][record['id']] = record
+        return record
+
+    def _transition(self, record, final_status):
+        if self.random.random() < self.transition_error_rate:
+            final_status = 'error'
+        record['_pending'] = (
+            time.monotonic() + self.transition_delay(self.random),
+            final_status)
+
+    def _delete(self, kind, record):
+        record['status'] = 'deleting'
+        record['_pending'] = (
+            time.monotonic() + self.transition_delay(self.random), None)
+
+    def _refresh(self, kind):
+        """Apply the transitions which are due"""
+        now = time.monotonic()
+        for resource_id, record in list(self.resources[kind].items()):
+            pending = record.get('_pending')
+            if pending is None or pending[0] > now:
+                continue
+            record['_pending'] = None
+            if pending[1] is None:
+                del self.resources[kind][resource_id]
+            else:
+                record['status'] = pending[1]
+                record['updated_at'] = _now()
+
+    def _get(self, kind, resource_id):
+        self._refresh(kind)
+        try:
+            return self.resources[kind][resource_id]
+        except KeyError:
+            raise _HTTPError(404, '%s %s could not be found.' %
+                             (kind[:-1], resource_id))
+
+    def _all(self, kind):
+        self._refresh(kind)
+        return list(self.resources[kind].values())
+
+    @staticmethod
+    def _public(record):
+        return {k: v for k, v in record.items() if not k.startswith('_')}
+
+    def _links(self, kind, record):
+        return [{'rel': 'self', 'href': '%s/volume/v3/%s/%s/%s' % (
+            self.base_url, record['project_id'], kind, record['id'])}]
+
+    def _view(self, kind, record, summary=False):
+        """Return the API view of a resource
+
+        Volumes, snapshots and backups are shown with the fields of the
+        Cinder views, which the tempest clients validate, and summarized
+        the way their create and non detailed list calls do.
+        """
+        if kind == 'volumes':
+            if summary:
+                return {'id': record['id'], 'name': record['name'],
+                        'links': self._links(kind, record)}
+            view = {k: record[k] for k in _VOLUME_FIELDS}
+            view['links'] = self._links(kind, record)
+            return view
+        if kind == 'snapshots':
+            view = {k: record[k] for k in _SNAPSHOT_FIELDS}
+            if not summary:
+                view['os-extended-snapshot-attributes:progress'] = (
+                    '100%' if record['status'] == 'available' else '0%')
+                view['os-extended-snapshot-attributes:project_id'] = (
+                    record['project_id'])
+            return view
+        if kind == 'backups':
+            if summary:
+                return {'id': record['id'], 'name': record['name'],
+                        'links': self._links(kind, record)}
+            view = {k: record[k] for k in _BACKUP_FIELDS}
+            view['links'] = self._links(kind, record)
+            view['has_dependent_backups'] = any(
+                b['parent_id'] == record['id'] for b in self._all(kind))
+            return view
+        if summary:
+            return {'id': record['id'], 'name': record.get('name')}
+        return self._public(record)
+
+    def _require_status(self, record, statuses, kind):
+        if record['status'] not in statuses:
+            raise _HTTPError(400, 'Invalid %s: status must be one of %s, '
+                             'not %s.' % (kind, ', '.join(statuses),
+                                          record['status']))
+
+    # Volumes
+
+    def create_volume(self, body):
+        params = body.get('volume') or {}
+        size = params.get('size')
+        source = None
+        if params.get('snapshot_id'):
+            source = self._get('snapshots', params['snapshot_id'])
+            size = size or source['size']
+        if params.get('source_volid'):
+            source = self._get('volumes', params['source_volid'])
+            size = size or source['size']
+        if source is not None:
+            self._require_status(source, ('available', 'in-use'), 'source')
+        if params.get('consistencygroup_id'):
+            self._get('consistencygroups', params['consistencygroup_id'])
+        if not size:
+            raise _HTTPError(400, 'Volume size must be set.')
+        volume = self._new('volumes', {
+            'name': params.get('name'),
+            'description': params.get('description'),
+            'size': int(size),
+            'volume_type': params.get('volume_type') or '__DEFAULT__',
+            'availability_zone': params.get('availability_zone', 'nova'),
+            'snapshot_id': params.get('snapshot_id'),
+            'source_volid': params.get('source_volid'),
+            'consistencygroup_id': params.get('consistencygroup_id'),
+            'metadata': params.get('metadata') or {},
+            'bootable': 'true' if params.get('imageRef') else 'false',
+            'multiattach': False,
+            'encrypted': False,
+            'replication_status': 'disabled',
+            'attachments': [],
+        })
+        return 202, {'volume': self._view('volumes', volume)}
+
+    def list_volumes(self, detail=False):
+        return 200, {'volumes': [self._view('volumes', v, not detail)
+                                 for v in self._all('volumes')]}
+
+    def show_volume(self, volume_id):
+        return 200, {'volume': self._view(
+            'volumes', self._get('volumes', volume_id))}
+
+    def update_volume(self, volume_id, body):
+        volume = self._get('volumes', volume_id)
+        params = body.get('volume') or {}
+        for key in ('name', 'description', 'metadata'):
+            if key in params:
+                volume[key] = params[key]
+        volume['updated_at'] = _now()
+        return 200, {'volume': self._view('volumes', volume)}
+
+    def delete_volume(self, volume_id, force=False):
+        volume = self._get('volumes', volume_id)
+        if not force:
+            self._require_status(
+                volume, ('available', 'error', 'error_restoring',
+                         'error_extending'), 'volume')
+            if any(s['volume_id'] == volume_id
+                   for s in self._all('snapshots')):
+                raise _HTTPError(400, 'Invalid volume: Volume %s still has '
+                                 'dependent snapshots.' % volume_id)
+        self._delete('volumes', volume)
+        return 202, None
+
+    def volume_action(self, volume_id, body):
+        volume = self._get('volumes', volume_id)
+        if len(body) != 1:
+            raise _HTTPError(400, 'Exactly one action is expected.')
+        action, params = next(iter(body.items()))
+        params = params or {}
+        if action == 'os-extend':
+            self._require_status(volume, ('available',), 'volume')
+            if int(params['new_size']) <= volume['size']:
+                raise _HTTPError(400, 'New size must be greater than the '
+                                 'current size.')
+            volume['size'] = int(params['new_size'])
+            volume['status'] = 'extending'
+            self._transition(volume, 'available')
+        elif action == 'os-reset_status':
+            volume['status'] = params['status']
+            volume['_pending'] = None
+        elif action == 'os-force_delete':
+            return self.delete_volume(volume_id, force=True)
+        elif action == 'revert':
+            self._require_status(volume, ('available',), 'volume')
+            snapshot = self._get('snapshots', params['snapshot_id'])
+            if snapshot['volume_id'] != volume_id:
+                raise _HTTPError(400, 'Snapshot %s does not belong to '
+                                 'volume %s.' % (snapshot['id'], volume_id))
+            volume['status'] = 'reverting'
+            self._transition(volume, 'available')
+        elif action == 'os-set_bootable':
+            volume['bootable'] = str(params['bootable']).lower()
+            return 200, None
+        elif action in ('os-update_readonly_flag', 'os-reserve',
+                        'os-unreserve', 'os-begin_detaching',
+                        'os-roll_detaching'):
+            pass
+        else:
+            raise _HTTPError(400, 'Unsupported action %s.' % action)
+        return 202, None
+
+    # Snapshots
+
+    def create_snapshot(self, body):
+        params = body.get('snapshot') or {}
+        volume = self._get('volumes', params.get('volume_id'))
+        statuses = ('available', 'in-use') if params.get('force') else (
+            'available',)
+        self._require_status(volume, statuses, 'volume')
+        snapshot = self._new('snapshots', {
+            'name': params.get('name'),
+            'description': params.get('description'),
+            'volume_id': volume['id'],
+            'size': volume['size'],
+            'metadata': params.get('metadata') or {},
+        })
+        return 202, {'snapshot': self._view('snapshots', snapshot, True)}
+
+    def list_snapshots(self, detail=False):
+        return 200, {'snapshots': [self._view('snapshots', s, not detail)
+                                   for s in self._all('snapshots')]}
+
+    def show_snapshot(self, snapshot_id):
+        return 200, {'snapshot': self._view(
+            'snapshots', self._get('snapshots', snapshot_id))}
+
+    def delete_snapshot(self, snapshot_id):
+        snapshot = self._get('snapshots', snapshot_id)
+        self._require_status(snapshot, ('available', 'error'), 'snapshot')
+        self._delete('snapshots', snapshot)
+        return 202, None
+
+    # Backups
+
+    def create_backup(self, body):
+        params = body.get('backup') or {}
+        volume = self._get('volumes', params.get('volume_id'))
+        statuses = ('available', 'in-use') if params.get('force') else (
+            'available',)
+        self._require_status(volume, statuses, 'volume')
+        parent_id = None
+        if params.get('incremental'):
+            parents = [b for b in self._all('backups')
+                       if b['volume_id'] == volume['id'] and
+                       b['status'] == 'available']
+            if not parents:
+                raise _HTTPError(400, 'No full backup to base an '
+                                 'incremental backup on.')
+            parent_id = max(parents, key=lambda b: b['created_at'])['id']
+        backup = self._new('backups', {
+            'name': params.get('name'),
+            'description': params.get('description'),
+            'volume_id': volume['id'],
+            'snapshot_id': params.get('snapshot_id'),
+            'size': volume['size'],
+            'is_incremental': parent_id is not None,
+            # Kept for the deletion rules, Cinder does not show it
+            'parent_id': parent_id,
+            'container': params.get('container'),
+            'availability_zone': volume['availability_zone'],
+            'object_count': 0,
+            'fail_reason': None,
+        })
+        backup['data_timestamp'] = backup['created_at']
+        return 202, {'backup': self._view('backups', backup, True)}
+
+    def list_backups(self, detail=False):
+        return 200, {'backups': [self._view('backups', b, not detail)
+                                 for b in self._all('backups')]}
+
+    def show_backup(self, backup_id):
+        return 200, {'backup': self._view(
+            'backups', self._get('backups', backup_id))}
+
+    def delete_backup(self, backup_id):
+        backup = self._get('backups', backup_id)
+        self._require_status(backup, ('available', 'error'), 'backup')
+        if any(b['parent_id'] == backup_id for b in self._all('backups')):
+            raise _HTTPError(400, 'Invalid backup: Incremental backups '
+                             'exist for this backup.')
+        self._delete('backups', backup)
+        return 202, None
+
+    def restore_backup(self, backup_id, body):
+        backup = self._get('backups', backup_id)
+        self._require_status(backup, ('available',), 'backup')
+        params = body.get('restore') or {}
+        if params.get('volume_id'):
+            volume = self._get('volumes', params['volume_id'])
+            self._require_status(volume, ('available',), 'volume')
+            volume['status'] = 'restoring-backup'
+            self._transition(volume, 'available')
+        else:
+            volume = self._new('volumes', {
+                'name': params.get('name') or 'restore_backup_%s' % backup_id,
+                'description': None,
+                'size': backup['size'],
+                'volume_type': '__DEFAULT__',
+                'availability_zone': backup['availability_zone'],
+                'snapshot_id': None,
+                'source_volid': None,
+                'consistencygroup_id': None,
+                'metadata': {},
+                'bootable': 'false',
+                'multiattach': False,
+                'encrypted': False,
+                'replication_status': 'disabled',
+                'attachments': [],
+            }, initial_status='restoring-backup')
+        backup['status'] = 'restoring'
+        self._transition(backup, 'available')
+        return 202, {'restore': {'backup_id': backup_id,
+                                 'volume_id': volume['id'],
+                                 'volume_name': volume['name']}}
+
+    # Consistency groups
+
+    def create_consistencygroup(self, body):
+        params = body.get('consistencygroup') or {}
+        group = self._new('consistencygroups', {
+            'name': params.get('name'),
+            'description': params.get('description'),
+            'volume_types': params.get('volume_types', '').split(','),
+            'availability_zone': params.get('availability_zone', 'nova'),
+        })
+        return 202, {'consistencygroup': self._view('consistencygroups',
+                                                    group)}
+
+    def create_consistencygroup_from_src(self, body):
+        params = body.get('consistencygroup-from-src') or {}
+        if params.get('cgsnapshot_id'):
+            source = self._get('cgsnapshots', params['cgsnapshot_id'])
+            source_group = self._get('consistencygroups',
+                                     source['consistencygroup_id'])
+        elif params.get('source_cgid'):
+            source = source_group = self._get('consistencygroups',
+                                              params['source_cgid'])
+        else:
+            raise _HTTPError(400, 'Either cgsnapshot_id or source_cgid '
+                             'must be set.')
+        self._require_status(source, ('available',), 'source')
+        group = self._new('consistencygroups', {
+            'name': params.get('name'),
+            'description': params.get('description'),
+            'volume_types': source_group['volume_types'],
+            'availability_zone': source_group['availability_zone'],
+        })
+        for volume in self._all('volumes'):
+            if volume['consistencygroup_id'] == source_group['id']:
+                self._new('volumes', dict(
+                    self._public(volume), consistencygroup_id=group['id'],
+                    source_volid=volume['id'], attachments=[]))
+        return 202, {'consistencygroup': self._view('consistencygroups',
+                                                    group)}
+
+    def list_consistencygroups(self, detail=False):
+        return 200, {'consistencygroups': [
+            self._view('consistencygroups', g, not detail)
+            for g in self._all('consistencygroups')]}
+
+    def show_consistencygroup(self, group_id):
+        return 200, {'consistencygroup': self._view(
+            'consistencygroups', self._get('consistencygroups', group_id))}
+
+    def delete_consistencygroup(self, group_id, body):
+        group = self._get('consistencygroups', group_id)
+        force = (body.get('consistencygroup') or {}).get('force')
+        members = [v for v in self._all('volumes')
+                   if v['consistencygroup_id'] == group_id]
+        if members and not force:
+            raise _HTTPError(400, 'Consistency group %s still contains '
+                             'volumes.' % group_id)
+        for volume in members:
+            self._delete('volumes', volume)
+        self._delete('consistencygroups', group)
+        return 202, None
+
+    def create_cgsnapshot(self, body):
+        params = body.get('cgsnapshot') or {}
+        group = self._get('consistencygroups',
+                          params.get('consistencygroup_id'))
+        self._require_status(group, ('available',), 'consistency group')
+        cgsnapshot = self._new('cgsnapshots', {
+            'name': params.get('name'),
+            'description': params.get('description'),
+            'consistencygroup_id': group['id'],
+        })
+        return 202, {'cgsnapshot': self._view('cgsnapshots', cgsnapshot)}
+
+    def list_cgsnapshots(self, detail=False):
+        return 200, {'cgsnapshots': [self._view('cgsnapshots', c, not detail)
+                                     for c in self._all('cgsnapshots')]}
+
+    def show_cgsnapshot(self, cgsnapshot_id):
+        return 200, {'cgsnapshot': self._view(
+            'cgsnapshots', self._get('cgsnapshots', cgsnapshot_id))}
+
+    def delete_cgsnapshot(self, cgsnapshot_id):
+        self._delete('cgsnapshots', self._get('cgsnapshots', cgsnapshot_id))
+        return 202, None
+
+    # Request handling
+
+    def handle(self, method, path, body):
+        """Handle one Cinder request
+
+        :returns: a (status, body) tuple, body being None for no content.
+        """
+        with self.lock:
+            self.request_count += 1
+            for fault in self.faults:
+                if (fault.matches(method, path) and
+                        self.random.random() < fault.probability):
+                    raise _HTTPError(fault.status, 'Injected fault.')
+            delay = self.latency(self.random)
+        time.sleep(delay)
+        for route_method, pattern, handler in _ROUTES:
+            if route_method != method:
+                continue
+            match = pattern.match(path)
+            if match is None:
+                continue
+            args = match.groups()[1:]
+            with self.lock:
+                self.project_id = match.group('project')
+                if method in ('POST', 'PUT'):
+                    return handler(self, *args, body=body)
+                return handler(self, *args)
+        raise _HTTPError(404, 'Unknown resource %s %s.' % (method, path))
+
+
+_ID = '([^/]+)'
+
+
+def _route(method, path, handler):
+    return method, re.compile(
+        r'^/volume/v3/(?P<project>[^/]+)/%s/?$' % path), handler
+
+
+_ROUTES = [
+    _route('POST', 'volumes', lambda s, body: s.create_volume(body)),
+    _route('GET', 'volumes', lambda s: s.list_volumes()),
+    _route('GET', 'volumes/detail', lambda s: s.list_volumes(True)),
+    _route('GET', 'volumes/' + _ID, FakeCinder.show_volume),
+    _route('PUT', 'volumes/' + _ID, FakeCinder.update_volume),
+    _route('DELETE', 'volumes/' + _ID, FakeCinder.delete_volume),
+    _route('POST', 'volumes/%s/action' % _ID, FakeCinder.volume_action),
+    _route('POST', 'snapshots', lambda s, body: s.create_snapshot(body)),
+    _route('GET', 'snapshots', lambda s: s.list_snapshots()),
+    _route('GET', 'snapshots/detail', lambda s: s.list_snapshots(True)),
+    _route('GET', 'snapshots/' + _ID, FakeCinder.show_snapshot),
+    _route('DELETE', 'snapshots/' + _ID, FakeCinder.delete_snapshot),
+    _route('POST', 'backups', lambda s, body: s.create_backup(body)),
+    _route('GET', 'backups', lambda s: s.list_backups()),
+    _route('GET', 'backups/detail', lambda s: s.list_backups(True)),
+    _route('GET', 'backups/' + _ID, FakeCinder.show_backup),
+    _route('DELETE', 'backups/' + _ID, FakeCinder.delete_backup),
+    _route('POST', 'backups/%s/restore' % _ID, FakeCinder.restore_backup),
+    _route('POST', 'consistencygroups',
+           lambda s, body: s.create_consistencygroup(body)),
+    _route('POST', 'consistencygroups/create_from_src',
+           lambda s, body: s.create_consistencygroup_from_src(body)),
+    _route('GET', 'consistencygroups', lambda s: s.list_consistencygroups()),
+    _route('GET', 'consistencygroups/detail',
+           lambda s: s.list_consistencygroups(True)),
+    _route('GET', 'consistencygroups/' + _ID,
+           FakeCinder.show_consistencygroup),
+    _route('POST', 'consistencygroups/%s/delete' % _ID,
+           FakeCinder.delete_consistencygroup),
+    _route('POST', 'cgsnapshots', lambda s, body: s.create_cgsnapshot(body)),
+    _route('GET', 'cgsnapshots', lambda s: s.list_cgsnapshots()),
+    _route('GET', 'cgsnapshots/detail', lambda s: s.list_cgsnapshots(True)),
+    _route('GET', 'cgsnapshots/' + _ID, FakeCinder.show_cgsnapshot),
+    _route('DELETE', 'cgsnapshots/' + _ID, FakeCinder.delete_cgsnapshot),
+]
+
+
+class _RequestHandler(http_server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=None, headers=None):
+        payload = json.dumps(body).encode('utf-8') if body is not None \
+            else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('x-openstack-request-id',
+                         'req-%s' % uuid.uuid4())
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        path = self.path.split('?', 1)[0]
+        try:
+            body = json.loads(raw) if raw else {}
+            if path.startswith('/identity/'):
+                status, reply, headers = self._identity(method, path, body)
+            elif path.rstrip('/') == '/volume':
+                status, reply, headers = self._versions()
+            else:
+                status, reply = self.server.cloud.handle(method, path, body)
+                headers = {}
+                microversion = self.headers.get('OpenStack-API-Version')
+                if microversion:
+                    headers['OpenStack-API-Version'] = microversion
+        except _HTTPError as exc:
+            name = _FAULT_NAMES.get(exc.status, 'computeFault')
+            status, headers = exc.status, {}
+            reply = {name: {'message': exc.message, 'code': exc.status}}
+        except (KeyError, TypeError, ValueError) as exc:
+            status, headers = 400, {}
+            reply = {'badRequest': {'message': 'Malformed request: %s' % exc,
+                                    'code': 400}}
+        self._reply(status, reply, headers)
+
+    def _identity(self, method, path, body):
+        if method != 'POST' or not path.rstrip('/').endswith('/auth/tokens'):
+            raise _HTTPError(404, 'Unknown identity resource %s.' % path)
+        scope = body['auth'].get('scope', {}).get('project', {})
+        project_id = scope.get('id') or uuid.uuid5(
+            uuid.NAMESPACE_DNS, scope.get('name', 'demo')).hex
+        host, port = self.server.server_address[:2]
+        url = 'http://%s:%s/volume/v3/%s' % (host, port, project_id)
+        endpoints = [{'id': uuid.uuid4().hex, 'interface': interface,
+                      'region': 'RegionOne', 'region_id': 'RegionOne',
+                      'url': url}
+                     for interface in ('public', 'internal', 'admin')]
+        expires = _utcnow() + datetime.timedelta(hours=1)
+        token = {
+            'methods': ['password'],
+            'expires_at': expires.strftime('%Y-%m-%dT%H:%M:%S.000000Z'),
+            'issued_at': _now() + 'Z',
+            'user': {'id': uuid.uuid4().hex, 'name': 'fake',
+                     'domain': {'id': 'default', 'name': 'Default'}},
+            'project': {'id': project_id,
+                        'name': scope.get('name', 'demo'),
+                        'domain': {'id': 'default', 'name': 'Default'}},
+            'roles': [{'id': uuid.uuid4().hex, 'name': role}
+                      for role in ('admin', 'member', 'reader')],
+            'catalog': [{'id': uuid.uuid4().hex, 'type': service_type,
+                         'name': 'cinder', 'endpoints': endpoints}
+                        for service_type in ('block-storage', 'volumev3')],
+        }
+        return 201, {'token': token}, {'X-Subject-Token': uuid.uuid4().hex}
+
+    def _versions(self):
+        host, port = self.server.server_address[:2]
+        return 300, {'versions': [{
+            'id': 'v3.0', 'status': 'CURRENT', 'version': '3.70',
+            'min_version': '3.0', 'updated': '2023-08-31T00:00:00Z',
+            'links': [{'rel': 'self',
+                       'href': 'http://%s:%s/volume/v3/' % (host, port)}],
+        }]}, {}
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+class FakeCinderServer(object):
+    """HTTP server serving a FakeCinder from a background thread
+
+    Usable as a context manager. The keyword arguments are passed to
+    FakeCinder.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, **kwargs):
+        self.cloud = FakeCinder(**kwargs)
+        self.httpd = http_server.ThreadingHTTPServer(
+            (host, port), _RequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.cloud = self.cloud
+        self.cloud.base_url = self.url
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    @property
+    def identity_uri(self):
+        """URI to use as [identity] uri_v3"""
+        return self.url + '/identity/v3'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Serve a fake Keystone and Cinder API.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8776)
+    parser.add_argument('--transition-delay', default='constant:0',
+                        help='Distribution of the time spent in transient '
+                             'states, e.g. uniform:0.5:2.')
+    parser.add_argument('--latency', default='constant:0',
+                        help='Distribution of the time added to every '
+                             'request, e.g. lognormal:-3:0.5.')
+    parser.add_argument('--fault', action='append', default=[],
+                        type=Fault.from_string,
+                        help='Fault to inject, as '
+                             '<status>[:<probability>[:<method>[:<path>]]]. '
+                             'May be repeated.')
+    parser.add_argument('--transition-error-rate', type=float, default=0.0,
+                        help='Chance for a resource to end in error.')
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    server = FakeCinderServer(
+        args.host, args.port, transition_delay=args.transition_delay,
+        latency=args.latency, faults=args.fault,
+        transition_error_rate=args.transition_error_rate, seed=args.seed)
+    print('Identity URI: %s' % server.identity_uri)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import itertools
+
+from oslo_serialization import jsonutils as json
+
+# Completion latency percentiles reported for every fio job
+LATENCY_PERCENTILES = ('50.000000', '95.000000', '99.000000', '99.900000')
+
+
+def job_matrix(rw_modes, block_sizes, iodepths):
+    """Return every (rw, bs, iodepth) combination of the given values."""
+    return [{'rw': rw, 'bs': bs, 'iodepth': int(iodepth)}
+            for rw, bs, iodepth in itertools.product(
+                rw_modes, block_sizes, iodepths)]
+
+
+def build_command(device, rw, bs, iodepth, runtime, size, name='cinder'):
+    """Build a fio command line running one job against a block device."""
+    return ('sudo fio --name=%(name)s --filename=%(device)s --rw=%(rw)s '
+            '--bs=%(bs)s --iodepth=%(iodepth)d --size=%(size)s '
+            '--runtime=%(runtime)d --time_based --ioengine=libaio '
+            '--direct=1 --output-format=json' %
+            {'name': name, 'device': device, 'rw': rw, 'bs': bs,
+             'iodepth': iodepth, 'size': size, 'runtime': runtime})
+
+
+def _parse_direction(stats):
+    clat = stats.get('clat_ns', {}).get('percentile', {})
+    return {
+        'iops': stats['iops'],
+        # fio reports bandwidth in KiB/s
+        'bw_kib': stats['bw'],
+        'clat_usec': {p.rstrip('0').rstrip('.'): clat[p] / 1000.0
+                      for p in LATENCY_PERCENTILES if p in clat},
+    }
+
+
+def parse_output(output):
+    """Summarize fio JSON output.
+
+    :param output: the stdout of fio run with --output-format=json.
+    :returns: a list with one dict per job holding the job options and, for
+        each direction that moved data, its IOPS, bandwidth in KiB/s and
+        completion latency percentiles in microseconds.
+    """
+    # fio may print warnings before the JSON document
+    data = json.loads(output[output.index('{'):])
+    results = []
+    for job in data['jobs']:
+        result = {'name': job['jobname'],
+                  'options': job.get('job options', {})}
+        for direction in ('read', 'write'):
+            stats = job.get(direction)
+            if stats and stats.get('io_bytes'):
+                result[direction] = _parse_direction(stats)
+        results.append(result)
+    return results
@@ -0,0 +1,205 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Timing of the REST calls made by the plugin clients
+
+instrument() wraps the raw_request method of a tempest REST client so that
+every HTTP exchange, retries included, is reported to the registered sinks
+as a RequestRecord. Sinks are registered with add_sink(), or from the
+`[volume] request_instrumentation_*` options on the first instrument()
+call of a process. Clients are left untouched while no sink is registered.
+"""
+
+import atexit
+import collections
+import re
+import socket
+import threading
+import time
+from urllib import parse
+
+from oslo_log import log
+from oslo_serialization import jsonutils as json
+from tempest import config
+
+from cinder_tempest_plugin.common import tracing
+
+LOG = log.getLogger(__name__)
+
+RequestRecord = collections.namedtuple('RequestRecord', [
+    'method', 'url_template', 'status', 'request_bytes', 'response_bytes',
+    'elapsed', 'request_id', 'timestamp'])
+
+# UUIDs, with or without dashes, and numeric IDs in URL paths
+_ID_RE = re.compile(r'/(?:[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?'
+                    r'[0-9a-f]{4}-?[0-9a-f]{12}|\d+)(?=/|$)', re.I)
+
+_SINKS = []
+_SINKS_LOCK = threading.Lock()
+_configured = False
+
+
+def url_template(url):
+    """Return the path of a URL with its IDs replaced by '{id}'"""
+    return _ID_RE.sub('/{id}', parse.urlsplit(url).path)
+
+
+class HistogramSink(object):
+    """Keep the latencies in memory, grouped by method and URL template"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = collections.defaultdict(list)
+
+    def __call__(self, record):
+        with self.lock:
+            self.latencies[(record.method, record.url_template)].append(
+                record.elapsed)
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Return call count and latency percentiles per call kind
+
+        :returns: a dict keyed by '<method> <url template>' holding the
+            count, total and percentiles of the elapsed times in seconds.
+        """
+        with self.lock:
+            latencies = {key: sorted(values)
+                         for key, values in self.latencies.items()}
+        summary = {}
+        for (method, template), values in sorted(latencies.items()):
+            entry = {'count': len(values), 'total': sum(values)}
+            for percentile in percentiles:
+                index = min(len(values) - 1,
+                            int(round(percentile / 100.0 * len(values))) - 1)
+                entry['p%s' % percentile] = values[max(index, 0)]
+            summary['%s %s' % (method, template)] = entry
+        return summary
+
+    def log_summary(self):
+        for call, entry in self.summary().items():
+            LOG.info('%s: %s', call, entry)
+
+
+class JsonlSink(object):
+    """Append one JSON document per call to a file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def __call__(self, record):
+        line = json.dumps(record._asdict()) + '\n'
+        with self.lock, open(self.path, 'a') as jsonl:
+            jsonl.write(line)
+
+
+class StatsdSink(object):
+    """Send a timer and a status counter per call to statsd over UDP"""
+
+    def __init__(self, host, port, prefix='cinder_tempest'):
+        self.address = (host, int(port))
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def _metric(self, record):
+        template = record.url_template.strip('/').replace('{id}', 'id')
+        return '%s.%s.%s' % (self.prefix, record.method.lower(),
+                             re.sub(r'[^\w-]+', '.', template) or 'root')
+
+    def __call__(self, record):
+        metric = self._metric(record)
+        payload = '%s:%.3f|ms\n%s.status.%s:1|c' % (
+            metric, record.elapsed * 1000, metric, record.status)
+        try:
+            self.socket.sendto(payload.encode('utf-8'), self.address)
+        except OSError:
+            LOG.debug('Could not send %s to statsd', metric, exc_info=True)
+
+
+def add_sink(sink):
+    """Register a callable receiving every RequestRecord"""
+    with _SINKS_LOCK:
+        _SINKS.append(sink)
+    return sink
+
+
+def remove_sink(sink):
+    with _SINKS_LOCK:
+        _SINKS.remove(sink)
+
+
+def _emit(record):
+    for sink in list(_SINKS):
+        try:
+            sink(record)
+        except Exception:
+            LOG.exception('Request instrumentation sink %s failed', sink)
+
+
+def _configure_from_conf():
+    global _configured
+    if _configured:
+        return
+    _configured = True
+    conf = config.CONF.volume
+    # The options are only registered once tempest loaded the plugin
+    for name in getattr(conf, 'request_instrumentation_sinks', []):
+        if name == 'histogram':
+            atexit.register(add_sink(HistogramSink()).log_summary)
+        elif name == 'jsonl':
+            add_sink(JsonlSink(conf.request_instrumentation_file))
+        elif name == 'statsd':
+            host, __, port = conf.request_instrumentation_statsd.rpartition(
+                ':')
+            add_sink(StatsdSink(
+                host, port, conf.request_instrumentation_statsd_prefix))
+    if tracing.trace_file():
+        # Tags the active spans with the request IDs of their API calls
+        add_sink(tracing.record_request)
+
+
+def _length(data):
+    if data is None:
+        return 0
+    return len(data.encode('utf-8') if isinstance(data, str) else data)
+
+
+def instrument(client):
+    """Report every HTTP exchange of a tempest REST client to the sinks
+
+    :param client: a tempest.lib.common.rest_client.RestClient.
+    :returns: the client, instrumented once at most.
+    """
+    _configure_from_conf()
+    if not _SINKS or getattr(client, '_instrumented', False):
+        return client
+    raw_request = client.raw_request
+
+    def timed_raw_request(url, method, headers=None, body=None, **kwargs):
+        start = time.monotonic()
+        resp, resp_body = raw_request(url, method, headers=headers,
+                                      body=body, **kwargs)
+        _emit(RequestRecord(
+            method=method, url_template=url_template(url),
+            status=resp.status, request_bytes=_length(body),
+            response_bytes=_length(resp_body),
+            elapsed=time.monotonic() - start,
+            request_id=resp.get('x-openstack-request-id'),
+            timestamp=time.time()))
+        return resp, resp_body
+
+    client.raw_request = timed_raw_request
+    client._instrumented = True
+    return client
@@ -0,0 +1,247 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Opt-in client side profiling of the plugin tests
+
+Profiling is enabled by `[volume] profiling_dir`, or by the
+CINDER_TEMPEST_PROFILE_DIR environment variable which takes precedence.
+The test bases then profile every test whose ID matches
+`[volume] profiling_tests`, and run_concurrent_tasks profiles its workers.
+Each profiled run writes to the directory:
+
+* <name>.prof, a cProfile dump to load with pstats or snakeviz, or
+  <name>.html with the pyinstrument engine
+* <name>.collapsed, the stacks seen by a sampling profiler in the
+  collapsed format of flamegraph.pl and speedscope
+
+Merge the collapsed stacks of a run into one flamegraph input with:
+
+    python -m cinder_tempest_plugin.common.profiling merge <dir>
+"""
+
+import argparse
+import collections
+import contextlib
+import cProfile
+import glob
+import os
+import re
+import sys
+import threading
+import time
+
+from oslo_log import log
+from tempest import config
+
+CONF = config.CONF
+
+LOG = log.getLogger(__name__)
+
+ENV_DIR = 'CINDER_TEMPEST_PROFILE_DIR'
+
+MERGED_NAME = 'merged.collapsed'
+
+# Engine profiling this process, or the process it was forked from
+_active = None
+
+
+def _option(name, default):
+    # The options are only registered once tempest loaded the plugin
+    return getattr(CONF.volume, name, default)
+
+
+def profiling_dir():
+    """Return the directory to write profiles to, None when disabled"""
+    return os.environ.get(ENV_DIR) or _option('profiling_dir', '') or None
+
+
+class StackSampler(object):
+    """Sample the stack of one thread and count the collapsed stacks"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def _collapse(frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append('%s (%s:%d)' % (
+                code.co_name, os.path.basename(code.co_filename),
+                code.co_firstlineno))
+            frame = frame.f_back
+        return ';'.join(reversed(stack))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.counts[self._collapse(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path):
+        with open(path, 'w') as collapsed:
+            for stack, count in sorted(self.counts.items()):
+                collapsed.write('%s %d\n' % (stack, count))
+
+
+class _CProfileEngine(object):
+
+    extension = '.prof'
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def start(self):
+        self.profiler.enable()
+
+    def discard(self):
+        self.profiler.disable()
+
+    def stop(self, path):
+        self.profiler.disable()
+        self.profiler.dump_stats(path)
+
+
+class _PyinstrumentEngine(object):
+
+    extension = '.html'
+
+    def __init__(self):
+        import pyinstrument
+        self.profiler = pyinstrument.Profiler(
+            interval=_option('profiling_sample_interval', 0.005))
+
+    def start(self):
+        self.profiler.start()
+
+    def discard(self):
+        self.profiler.stop()
+
+    def stop(self, path):
+        self.profiler.stop()
+        with open(path, 'w') as html:
+            html.write(self.profiler.output_html())
+
+
+def _engine():
+    if _option('profiling_engine', 'cprofile') == 'pyinstrument':
+        try:
+            return _PyinstrumentEngine()
+        except ImportError:
+            LOG.warning('pyinstrument is not installed, profiling with '
+                        'cProfile instead')
+    return _CProfileEngine()
+
+
+@contextlib.contextmanager
+def profile(name):
+    """Profile the calling thread while the context is active
+
+    Nested calls in the same process are covered by the outer profile.
+    In a process forked while a profile was active, the inherited profiler
+    is stopped first: since Python 3.12 only one cProfile profiler can be
+    enabled at a time.
+
+    :param name: base name of the files written, made unique per process.
+    """
+    global _active
+    directory = profiling_dir()
+    if directory is None:
+        yield
+        return
+    if _active is not None:
+        engine, pid = _active
+        if pid == os.getpid():
+            yield
+            return
+        engine.discard()
+        _active = None
+    os.makedirs(directory, exist_ok=True)
+    base = os.path.join(directory, '%s.%d' % (
+        re.sub(r'[^\w.-]+', '_', name), os.getpid()))
+    engine = _engine()
+    sampler = StackSampler(threading.get_ident(),
+                           _option('profiling_sample_interval', 0.005))
+    sampler.start()
+    engine.start()
+    _active = (engine, os.getpid())
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _active = None
+        engine.stop(base + engine.extension)
+        sampler.stop()
+        sampler.write(base + '.collapsed')
+        LOG.debug('Profiled %s for %.3f s into %s', name,
+                  time.monotonic() - start, base)
+
+
+def profile_test(test):
+    """Profile a test from setUp until its cleanups, if selected"""
+    if profiling_dir() is None:
+        return
+    selected = _option('profiling_tests', '')
+    if selected and not re.search(selected, test.id()):
+        return
+    context = profile(test.id())
+    context.__enter__()
+    test.addCleanup(context.__exit__, None, None, None)
+
+
+def merge(directory):
+    """Sum the collapsed stacks of a directory into MERGED_NAME
+
+    :returns: the path of the merged file.
+    """
+    counts = collections.Counter()
+    for path in glob.glob(os.path.join(directory, '*.collapsed')):
+        if os.path.basename(path) == MERGED_NAME:
+            continue
+        with open(path) as collapsed:
+            for line in collapsed:
+                stack, __, count = line.rstrip('\n').rpartition(' ')
+                counts[stack] += int(count)
+    merged = os.path.join(directory, MERGED_NAME)
+    with open(merged, 'w') as output:
+        for stack, count in sorted(counts.items()):
+            output.write('%s %d\n' % (stack, count))
+    return merged
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Tools for the profiles of the plugin tests.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    merge_parser = subparsers.add_parser(
+        'merge', help='Merge the collapsed stacks of a profiling directory.')
+    merge_parser.add_argument('directory')
+    args = parser.parse_args()
+    print(merge(args.directory))
+
+
+if __name__ == '__main__':
+    main()
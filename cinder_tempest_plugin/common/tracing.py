@@ -0,0 +1,231 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Optional tracing of the plugin helpers
+
+Tracing is enabled by `[volume] tracing_file`, or by the
+CINDER_TEMPEST_TRACE_FILE environment variable which takes precedence.
+The test helpers then open nested spans, tagged with the ID of the
+resource they handle and with the x-openstack-request-id of every API
+call made while they are active, which correlates them with the Cinder
+logs.
+
+Every finished span is appended to the file as one line of OTLP JSON (an
+ExportTraceServiceRequest), the format of the OpenTelemetry collector file
+exporter, which trace viewers such as Jaeger can import.
+
+The active span lives in a context variable. Use wrap() to carry it into
+threads; run_concurrent_tasks carries it into its worker processes.
+"""
+
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+
+from oslo_serialization import jsonutils as json
+from tempest import config
+
+CONF = config.CONF
+
+ENV_FILE = 'CINDER_TEMPEST_TRACE_FILE'
+
+SERVICE_NAME = 'cinder-tempest-plugin'
+
+_current_span = contextvars.ContextVar('cinder_tempest_span', default=None)
+_write_lock = threading.Lock()
+
+
+def trace_file():
+    """Return the file spans are exported to, None when disabled"""
+    # The option is only registered once tempest loaded the plugin
+    return (os.environ.get(ENV_FILE) or
+            getattr(CONF.volume, 'tracing_file', '') or None)
+
+
+class Span(object):
+
+    def __init__(self, name, trace_id, parent_span_id, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.attributes = dict(attributes)
+        self.events = []
+        self.error = None
+        self.start = time.time_ns()
+        self.end = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def add_event(self, name, **attributes):
+        self.events.append((time.time_ns(), name, attributes))
+
+    @staticmethod
+    def _otlp_attributes(attributes):
+        otlp = []
+        for key, value in sorted(attributes.items()):
+            if isinstance(value, bool):
+                typed = {'boolValue': value}
+            elif isinstance(value, int):
+                typed = {'intValue': str(value)}
+            elif isinstance(value, float):
+                typed = {'doubleValue': value}
+            elif isinstance(value, (list, tuple)):
+                typed = {'arrayValue': {'values': [
+                    {'stringValue': str(item)} for item in value]}}
+            else:
+                typed = {'stringValue': str(value)}
+            otlp.append({'key': key, 'value': typed})
+        return otlp
+
+    def to_otlp(self):
+        span = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'name': self.name,
+            # SPAN_KIND_INTERNAL
+            'kind': 1,
+            'startTimeUnixNano': str(self.start),
+            'endTimeUnixNano': str(self.end),
+            'attributes': self._otlp_attributes(self.attributes),
+            'events': [{'timeUnixNano': str(timestamp), 'name': name,
+                        'attributes': self._otlp_attributes(attributes)}
+                       for timestamp, name, attributes in self.events],
+            # STATUS_CODE_OK or STATUS_CODE_ERROR
+            'status': ({'code': 2, 'message': self.error} if self.error
+                       else {'code': 1}),
+        }
+        if self.parent_span_id:
+            span['parentSpanId'] = self.parent_span_id
+        return {'resourceSpans': [{
+            'resource': {'attributes': self._otlp_attributes(
+                {'service.name': SERVICE_NAME, 'process.pid': os.getpid()})},
+            'scopeSpans': [{'scope': {'name': __name__},
+                            'spans': [span]}],
+        }]}
+
+
+def _export(span, path):
+    line = (json.dumps(span.to_otlp()) + '\n').encode('utf-8')
+    # A single O_APPEND write keeps the lines of concurrent processes whole
+    with _write_lock:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """Open a span, child of the active one, for the duration of the block
+
+    :returns: the Span, or None when tracing is disabled.
+    """
+    path = trace_file()
+    if path is None:
+        yield None
+        return
+    parent = _current_span.get()
+    current = Span(name, parent.trace_id if parent else os.urandom(16).hex(),
+                   parent.span_id if parent else None, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.error = '%s: %s' % (type(exc).__name__, exc)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end = time.time_ns()
+        _export(current, path)
+
+
+def set_attribute(key, value):
+    """Tag the active span, if any"""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attribute(key, value)
+
+
+def traced(name=None, resource_kind=None):
+    """Decorator running a helper in a span
+
+    :param name: span name, the qualified name of the helper by default.
+    :param resource_kind: when set, a dict result with an 'id' tags the
+        span with <resource_kind>.id.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if trace_file() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                result = func(*args, **kwargs)
+                if (resource_kind and isinstance(result, dict) and
+                        'id' in result):
+                    set_attribute('%s.id' % resource_kind, result['id'])
+                return result
+        return wrapper
+    return decorator
+
+
+def record_request(record):
+    """Request instrumentation sink adding the API calls to the spans"""
+    current = _current_span.get()
+    if current is None:
+        return
+    request_ids = current.attributes.setdefault('openstack.request_ids', [])
+    if record.request_id:
+        request_ids.append(record.request_id)
+    current.add_event('http.request', **{
+        'http.method': record.method,
+        'http.route': record.url_template,
+        'http.status_code': record.status,
+        'http.duration': record.elapsed,
+        'openstack.request_id': record.request_id or ''})
+
+
+def current_context():
+    """Return the (trace ID, span ID) to hand to another process"""
+    current = _current_span.get()
+    return (current.trace_id, current.span_id) if current else None
+
+
+@contextlib.contextmanager
+def attach(context):
+    """Make spans opened in the block children of a current_context()"""
+    if context is None:
+        yield
+        return
+    parent = Span('remote-parent', context[0], None, {})
+    parent.span_id = context[1]
+    token = _current_span.set(parent)
+    try:
+        yield
+    finally:
+        _current_span.reset(token)
+
+
+def wrap(func):
+    """Bind a callable to the active span, for running it in a thread"""
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
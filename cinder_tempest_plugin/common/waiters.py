@@ -0,0 +1,277 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+"""Volume resource waiters accounting for the time they spend
+
+The waiters behave like their tempest counterparts but record, for every
+wait, the number of polls, the time slept between them and the window in
+which the transition happened: after the last poll that did not show the
+target state and no later than the first one that did. The time after
+the last miss is at most the share of `build_interval` quantization.
+
+Tests call add_wait_details() to attach the waits they did to their
+result.
+"""
+
+import re
+import threading
+import time
+from urllib import parse as urlparse
+
+from oslo_log import log
+from tempest.common import waiters
+from tempest import exceptions
+from tempest.lib import exceptions as lib_exc
+from testtools import content
+
+from cinder_tempest_plugin.common import tracing
+
+LOG = log.getLogger(__name__)
+
+_WAITS = []
+_WAITS_LOCK = threading.Lock()
+# Number of records already dropped from _WAITS, so that markers keep
+# counting from the start of the process
+_WAITS_DROPPED = 0
+
+
+class _WaitRecorder(object):
+
+    def __init__(self, resource_type, resource_id, target):
+        self.record = {'resource_type': resource_type,
+                       'resource_id': resource_id, 'target': target,
+                       'polls': 0, 'sleep': 0.0, 'last_miss': None}
+        self.start = time.monotonic()
+
+    def poll(self, reached):
+        self.record['polls'] += 1
+        if not reached:
+            self.record['last_miss'] = time.monotonic() - self.start
+
+    def sleep(self, interval):
+        start = time.monotonic()
+        time.sleep(interval)
+        self.record['sleep'] += time.monotonic() - start
+
+    def done(self, outcome):
+        self.record['elapsed'] = time.monotonic() - self.start
+        self.record['outcome'] = outcome
+        with _WAITS_LOCK:
+            _WAITS.append(self.record)
+
+
+def _resource_name(client):
+    return re.findall(r'(volume|group-snapshot|snapshot|backup|group)',
+                      client.resource_type)[-1].replace('-', '_')
+
+
+@tracing.traced()
+def wait_for_volume_resource_status(client, resource_id, status,
+                                    server_id=None, servers_client=None):
+    """Waits for a volume resource to reach a given status
+
+    Same as tempest.common.waiters.wait_for_volume_resource_status, which
+    still does the waits given a server_id, so that its console is dumped
+    if they time out.
+    """
+    if server_id:
+        return waiters.wait_for_volume_resource_status(
+            client, resource_id, status, server_id=server_id,
+            servers_client=servers_client)
+    resource_name = _resource_name(client)
+    tracing.set_attribute('cinder.%s.id' % resource_name, resource_id)
+    tracing.set_attribute('cinder.target_status', status)
+    show_resource = getattr(client, 'show_' + resource_name)
+    recorder = _WaitRecorder(resource_name, resource_id, status)
+    outcome = 'error'
+    try:
+        resource_status = show_resource(resource_id)[resource_name]['status']
+        recorder.poll(resource_status == status)
+        while resource_status != status:
+            recorder.sleep(client.build_interval)
+            resource_status = (
+                show_resource(resource_id)[resource_name]['status'])
+            recorder.poll(resource_status == status)
+            if resource_status == 'error' and resource_status != status:
+                raise exceptions.VolumeResourceBuildErrorException(
+                    resource_name=resource_name, resource_id=resource_id)
+            if (resource_name == 'volume' and
+                    resource_status == 'error_restoring'):
+                raise exceptions.VolumeRestoreErrorException(
+                    volume_id=resource_id)
+            if (resource_status == 'error_extending' and
+                    resource_status != status):
+                raise exceptions.VolumeExtendErrorException(
+                    volume_id=resource_id)
+            if time.monotonic() - recorder.start >= client.build_timeout:
+                outcome = 'timeout'
+                raise lib_exc.TimeoutException(
+                    '%s %s failed to reach %s status (current %s) within '
+                    'the required time (%s s).' %
+                    (resource_name, resource_id, status, resource_status,
+                     client.build_timeout))
+        outcome = 'reached'
+    finally:
+        recorder.done(outcome)
+    LOG.info('%s %s reached %s after waiting for %f seconds',
+             resource_name, resource_id, status, recorder.record['elapsed'])
+
+
+@tracing.traced()
+def wait_for_resource_deletion(client, resource_id):
+    """Waits for a resource to be deleted
+
+    Same as RestClient.wait_for_resource_deletion.
+    """
+    tracing.set_attribute('cinder.resource_id', resource_id)
+    recorder = _WaitRecorder(client.resource_type, resource_id, 'deleted')
+    outcome = 'error'
+    try:
+        while True:
+            deleted = client.is_resource_deleted(resource_id)
+            recorder.poll(deleted)
+            if deleted:
+                outcome = 'reached'
+                return
+            if time.monotonic() - recorder.start >= client.build_timeout:
+                outcome = 'timeout'
+                raise lib_exc.TimeoutException(
+                    '%s %s failed to delete within the required time '
+                    '(%s s).' % (client.resource_type, resource_id,
+                                 client.build_timeout))
+            recorder.sleep(client.build_interval)
+    finally:
+        recorder.done(outcome)
+
+
+def list_resources(client, resource_name):
+    """List every volume, snapshot or backup, following the next links
+
+    Cinder truncates the lists to osapi_max_limit entries and links to the
+    next page, whose query carries the marker.
+    """
+    lister = getattr(client, 'list_%ss' % resource_name)
+    params = {}
+    resources = []
+    while True:
+        # Only the volumes client takes the query as a dict argument
+        if resource_name == 'volume':
+            body = lister(detail=True, params=params)
+        else:
+            body = lister(detail=True, **params)
+        resources.extend(body['%ss' % resource_name])
+        next_pages = [link['href'] for link
+                      in body.get('%ss_links' % resource_name, [])
+                      if link.get('rel') == 'next']
+        if not next_pages:
+            return resources
+        params = dict(urlparse.parse_qsl(
+            urlparse.urlsplit(next_pages[0]).query))
+
+
+@tracing.traced()
+def wait_for_resources_deletion(pending):
+    """Waits for several resources to be deleted, with one list per poll
+
+    Every poll lists each resource type once instead of showing every
+    resource, so that waiting on a batch costs as many calls per poll as
+    there are resource types and pages of them.
+
+    :param pending: dict of the IDs to wait for keyed by the volume,
+        snapshot or backup client listing them.
+    """
+    pending = {client: set(ids) for client, ids in pending.items() if ids}
+    if not pending:
+        return
+    tracing.set_attribute('cinder.resource_count',
+                          sum(len(ids) for ids in pending.values()))
+    recorder = _WaitRecorder('batch', None, 'deleted')
+    recorder.record['resources'] = sum(len(ids) for ids in pending.values())
+    outcome = 'error'
+    try:
+        while True:
+            for client in list(pending):
+                resource_name = _resource_name(client)
+                listed = list_resources(client, resource_name)
+                statuses = {resource['id']: resource['status']
+                            for resource in listed
+                            if resource['id'] in pending[client]}
+                failed = sorted(resource_id for resource_id, status
+                                in statuses.items()
+                                if status == 'error_deleting')
+                if failed:
+                    raise lib_exc.DeleteErrorException(
+                        resource_id='%s %s' % (resource_name,
+                                               ', '.join(failed)))
+                pending[client].intersection_update(statuses)
+                if not pending[client]:
+                    del pending[client]
+            recorder.poll(not pending)
+            if not pending:
+                outcome = 'reached'
+                return
+            client = next(iter(pending))
+            if time.monotonic() - recorder.start >= client.build_timeout:
+                outcome = 'timeout'
+                raise lib_exc.TimeoutException(
+                    '%s failed to delete within the required time (%s s).'
+                    % (', '.join(sorted(
+                        '%s %s' % (_resource_name(c), resource_id)
+                        for c, ids in pending.items()
+                        for resource_id in ids)), client.build_timeout))
+            recorder.sleep(client.build_interval)
+    finally:
+        recorder.done(outcome)
+
+
+def mark():
+    """Return a marker for add_wait_details"""
+    with _WAITS_LOCK:
+        return _WAITS_DROPPED + len(_WAITS)
+
+
+def summarize(waits):
+    """Total the polls, sleep and wait time of the given waits"""
+    return {
+        'waits': len(waits),
+        'polls': sum(w['polls'] for w in waits),
+        'sleep': sum(w['sleep'] for w in waits),
+        'elapsed': sum(w['elapsed'] for w in waits),
+        # The transitions took at least until the last poll missing them,
+        # the rest of 'elapsed' is at most polling quantization
+        'transition_min': sum(w['last_miss'] or 0.0 for w in waits),
+        'quantization_max': sum(w['elapsed'] - (w['last_miss'] or 0.0)
+                                for w in waits),
+    }
+
+
+def add_wait_details(test, since):
+    """Attach the waits done since a marker to a test result
+
+    The recorded waits are dropped afterwards, including the ones done
+    before the marker, such as the waits of the class setup, which no
+    test reports.
+
+    :param test: the test case to add the 'volume-waits' detail to.
+    :param since: a marker returned by mark().
+    """
+    global _WAITS_DROPPED
+    with _WAITS_LOCK:
+        waits = _WAITS[max(0, since - _WAITS_DROPPED):]
+        _WAITS_DROPPED += len(_WAITS)
+        del _WAITS[:]
+    if waits:
+        test.addDetail('volume-waits', content.json_content(
+            {'summary': summarize(waits), 'waits': waits}))
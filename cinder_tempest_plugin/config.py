@@ -34,6 +34,18 @@ cinder_option = [
     cfg.BoolOpt('concurrency_tests',
                 default=False,
                 help='Enable or disable running concurrency tests.'),
+    cfg.BoolOpt('fio_benchmark_tests',
+                default=False,
+                help='Enable or disable running the in-guest fio benchmark '
+                     'scenario. The guest image must provide fio.'),
+    cfg.BoolOpt('benchmark_tests',
+                default=False,
+                help='Enable or disable running the Cinder API benchmark '
+                     'workloads.'),
+    cfg.BoolOpt('dependency_scale_tests',
+                default=False,
+                help='Enable or disable running the volume dependency '
+                     'chain scale tests.'),
 ]
 
 # The barbican service is discovered by config_tempest [1], and will appear
@@ -52,4 +64,145 @@ concurrency_option = [
     cfg.IntOpt('concurrent_resource_count',
                default=5,
                help='Number of resources to create concurrently.'),
+    cfg.IntOpt('rbac_pool_stats_cache_ttl',
+               default=300,
+               min=0,
+               help='Seconds the RBAC tests reuse the scheduler pool stats '
+                    'and backend capabilities they looked up, across all '
+                    'the persona test classes. 0 disables the cache.'),
+    cfg.IntOpt('dependency_scale_depth',
+               default=10,
+               min=1,
+               help='Number of levels of the volume dependency chains '
+                    'built by the dependency scale tests.'),
+    cfg.IntOpt('dependency_scale_fanout',
+               default=1,
+               min=1,
+               help='Number of dependency chains grown from the same root '
+                    'volume by the dependency scale tests. Every level '
+                    'creates one resource per chain concurrently.'),
+]
+
+scenario_option = [
+    cfg.StrOpt('disk_discovery_mode',
+               default='poll',
+               choices=['poll', 'watch'],
+               help="How scenario tests discover the guest device of a "
+                    "newly attached volume. 'poll' lists the guest disks "
+                    "over a new SSH command every "
+                    "`[compute] build_interval` seconds; 'watch' runs a "
+                    "single long-lived watcher in the guest which reports "
+                    "the new device as soon as the kernel exposes it."),
+    cfg.IntOpt('snapshot_integrity_count',
+               default=3,
+               help='Number of snapshots taken, then restored and verified '
+                    'concurrently, by the snapshot data integrity '
+                    'scenario.'),
+    cfg.IntOpt('multiattach_server_count',
+               default=3,
+               help='Number of servers a multiattach volume is attached to '
+                    'in parallel by the multiattach fan-out scenario.'),
+    cfg.IntOpt('server_pool_size',
+               default=0,
+               help='Number of servers booted once per scenario test class '
+                    'and leased to its attach/detach tests, instead of '
+                    'booting a server in every test. 0 disables the pool.'),
+    cfg.ListOpt('fio_rw_modes',
+                default=['read', 'write', 'randread', 'randwrite'],
+                help='fio I/O patterns (fio --rw values) run by the fio '
+                     'benchmark scenario.'),
+    cfg.ListOpt('fio_block_sizes',
+                default=['4k', '1M'],
+                help='fio block sizes run by the fio benchmark scenario.'),
+    cfg.ListOpt('fio_iodepths',
+                default=['1', '32'],
+                help='fio I/O depths run by the fio benchmark scenario.'),
+    cfg.IntOpt('fio_runtime',
+               default=30,
+               help='Run time in seconds of each fio job.'),
+    cfg.StrOpt('fio_size',
+               default='256M',
+               help='Size of the device region exercised by each fio job.'),
+]
+
+instrumentation_option = [
+    cfg.ListOpt('request_instrumentation_sinks',
+                default=[],
+                item_type=cfg.types.String(
+                    choices=['histogram', 'jsonl', 'statsd']),
+                help="Where to report the timing of every REST call made "
+                     "by the plugin clients. 'histogram' logs per-call "
+                     "latency percentiles when the process exits, 'jsonl' "
+                     "appends one record per call to "
+                     "`request_instrumentation_file` and 'statsd' sends "
+                     "timers to `request_instrumentation_statsd`. Empty "
+                     "disables the instrumentation."),
+    cfg.StrOpt('request_instrumentation_file',
+               default='cinder-tempest-requests.jsonl',
+               help='File the jsonl request instrumentation sink appends '
+                    'to.'),
+    cfg.StrOpt('request_instrumentation_statsd',
+               default='127.0.0.1:8125',
+               help='host:port of the statsd daemon the statsd request '
+                    'instrumentation sink sends to.'),
+    cfg.StrOpt('request_instrumentation_statsd_prefix',
+               default='cinder_tempest',
+               help='Prefix of the metrics sent by the statsd request '
+                    'instrumentation sink.'),
+    cfg.StrOpt('profiling_dir',
+               default='',
+               help='Directory to write client side profiles of the plugin '
+                    'tests and concurrent workers to. The '
+                    'CINDER_TEMPEST_PROFILE_DIR environment variable takes '
+                    'precedence. Empty disables profiling.'),
+    cfg.StrOpt('profiling_tests',
+               default='',
+               help='Regular expression selecting the IDs of the tests to '
+                    'profile. Empty profiles all of them.'),
+    cfg.StrOpt('profiling_engine',
+               default='cprofile',
+               choices=['cprofile', 'pyinstrument'],
+               help='Profiler writing the per-test profiles. pyinstrument '
+                    'must be installed separately.'),
+    cfg.FloatOpt('profiling_sample_interval',
+                 default=0.005,
+                 min=0.0001,
+                 help='Seconds between two stack samples of the sampling '
+                      'profiler.'),
+    cfg.StrOpt('tracing_file',
+               default='',
+               help='File to append the spans of the plugin test helpers '
+                    'to, as OTLP JSON lines. The '
+                    'CINDER_TEMPEST_TRACE_FILE environment variable takes '
+                    'precedence. Empty disables tracing.'),
+]
+
+benchmark_option = [
+    cfg.IntOpt('benchmark_concurrency',
+               default=5,
+               min=1,
+               help='Number of workers running each benchmark workload '
+                    'concurrently.'),
+    cfg.IntOpt('benchmark_iterations',
+               default=3,
+               min=1,
+               help='Number of operations each benchmark worker runs in '
+                    'a row.'),
+    cfg.StrOpt('benchmark_baseline',
+               default='',
+               help='JSON file of reference benchmark results, mapping '
+                    'each workload name to the content of its results '
+                    'file in `benchmark_results_dir`. The benchmarks fail '
+                    'when they regress by more than `benchmark_tolerance` '
+                    'from it. Empty only records the results.'),
+    cfg.FloatOpt('benchmark_tolerance',
+                 default=0.2,
+                 min=0,
+                 help='Allowed relative regression of the benchmark '
+                      'latency percentiles and throughput from the '
+                      'baseline, unless the baseline sets its own.'),
+    cfg.StrOpt('benchmark_results_dir',
+               default='',
+               help='Directory the benchmarks write their results to, one '
+                    'JSON file per workload. Empty disables writing.'),
 ]
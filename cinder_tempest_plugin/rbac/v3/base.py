@@ -11,16 +11,49 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
+import time
+
 from tempest.common import waiters
 from tempest import config
 from tempest.lib.common import api_version_utils
 from tempest.lib.common.utils import data_utils
 from tempest.lib.common.utils import test_utils
 from tempest.lib.decorators import cleanup_order
+from tempest.lib import exceptions
 from tempest import test
 
+from cinder_tempest_plugin.common import profiling
+
 CONF = config.CONF
 
+# Read-only fixtures shared by the persona classes of a resource family,
+# keyed by (project ID, fixture spec). See get_shared_fixture.
+_SHARED_FIXTURES = {}
+
+
+def _release_shared_fixture(key, delete):
+    fixture = _SHARED_FIXTURES.pop(key, None)
+    if fixture is not None:
+        delete(fixture)
+
+
+# Scheduler pool stats and backend capabilities shared by all the persona
+# classes, keyed by lookup and stored with their fetch time.
+# See get_pools and get_backend_capabilities.
+_POOL_STATS_CACHE = {}
+
+
+def _cached_pool_stats(key, fetch):
+    ttl = CONF.volume.rbac_pool_stats_cache_ttl
+    now = time.monotonic()
+    entry = _POOL_STATS_CACHE.get(key)
+    if entry is None or now - entry[0] >= ttl:
+        entry = (now, fetch())
+        if ttl:
+            _POOL_STATS_CACHE[key] = entry
+    return entry[1]
+
 
 class VolumeV3RbacBaseTests(
     api_version_utils.BaseMicroversionTest, test.BaseTestCase
@@ -50,6 +83,7 @@ class VolumeV3RbacBaseTests(
 
     def setUp(self):
         super(VolumeV3RbacBaseTests, self).setUp()
+        profiling.profile_test(self)
 
     @classmethod
     def resource_setup(cls):
@@ -184,3 +218,183 @@ class VolumeV3RbacBaseTests(
             backup_client, backup['id'], 'available'
         )
         return backup
+
+    @classmethod
+    def get_shared_fixture(cls, spec, create, delete):
+        """Return a read-only fixture shared across persona classes
+
+        Fixtures are created once with the project admin client and handed
+        to every class running with the same project, so the reader, member
+        and admin classes of a resource family stop building the same
+        resources one after the other. Tests must not modify them and
+        should create private resources for mutating operations.
+
+        With dynamic credentials every class runs in its own project, which
+        also owns the fixtures, so they cannot outlive the class and are
+        deleted in its cleanup. With pre-provisioned credentials they are
+        deleted when the test run ends.
+
+        Args:
+            spec: Hashable description of the fixture
+            create: Callable without arguments creating the fixture
+            delete: Callable deleting the fixture it is given
+
+        Returns:
+            The fixture returned by create
+        """
+        key = (cls.os_project_admin.credentials.project_id, spec)
+        if key not in _SHARED_FIXTURES:
+            _SHARED_FIXTURES[key] = create()
+            if CONF.auth.use_dynamic_credentials:
+                cls.addClassResourceCleanup(
+                    _release_shared_fixture, key, delete)
+            else:
+                atexit.register(_release_shared_fixture, key, delete)
+        return _SHARED_FIXTURES[key]
+
+    @classmethod
+    def get_shared_volume(cls, purpose='read-only'):
+        """Return the ID of a shared volume
+
+        Args:
+            purpose: 'read-only' for the fixture of read-only tests,
+                'sentinel' for the target of calls expected to be Forbidden
+        """
+        client = cls.os_project_admin.volumes_client_latest
+
+        def _create():
+            volume_id = client.create_volume(
+                size=CONF.volume.volume_size,
+                name=data_utils.rand_name(
+                    VolumeV3RbacBaseTests.__name__ + '-SharedVolume')
+            )['volume']['id']
+            waiters.wait_for_volume_resource_status(
+                client=client, resource_id=volume_id, status='available'
+            )
+            return volume_id
+
+        return cls.get_shared_fixture(
+            ('volume', purpose, CONF.volume.volume_size), _create,
+            lambda volume_id: cls.delete_resource(
+                client=client, volume_id=volume_id)
+        )
+
+    @classmethod
+    def get_shared_snapshot(cls, purpose='read-only'):
+        """Return the ID of a shared snapshot, see get_shared_volume"""
+        client = cls.os_project_admin.snapshots_client_latest
+        volume_id = cls.get_shared_volume(purpose)
+
+        def _create():
+            snapshot_id = client.create_snapshot(
+                volume_id=volume_id,
+                name=data_utils.rand_name(
+                    VolumeV3RbacBaseTests.__name__ + '-SharedSnapshot')
+            )['snapshot']['id']
+            waiters.wait_for_volume_resource_status(
+                client=client, resource_id=snapshot_id, status='available'
+            )
+            return snapshot_id
+
+        return cls.get_shared_fixture(
+            ('snapshot', volume_id), _create,
+            lambda snapshot_id: cls.delete_resource(
+                client=client, snapshot_id=snapshot_id)
+        )
+
+    @classmethod
+    def get_shared_backup(cls, purpose='read-only'):
+        """Return a shared backup, see get_shared_volume"""
+        client = cls.os_project_admin.backups_client_latest
+        volume_id = cls.get_shared_volume(purpose)
+        return cls.get_shared_fixture(
+            ('backup', volume_id),
+            lambda: cls.create_backup(
+                volume_id=volume_id, backup_client=client, add_cleanup=False
+            ),
+            lambda backup: cls.delete_resource(
+                client=client, backup_id=backup['id'])
+        )
+
+    @classmethod
+    def get_pools(cls, detail=False):
+        """Return the scheduler pools, cached for the whole run
+
+        Args:
+            detail: Whether to include the pool capabilities. Without it
+                the response only holds the pool names, which is much
+                smaller on deployments with many pools.
+        """
+        client = cls.os_project_admin.volume_scheduler_stats_client_latest
+        return _cached_pool_stats(
+            ('pools', detail),
+            lambda: client.list_pools(detail=detail)['pools'])
+
+    @classmethod
+    def get_pool_host_names(cls):
+        """Return the host names of the scheduler pools"""
+        return [pool['name'] for pool in cls.get_pools()]
+
+    @classmethod
+    def get_backend_capabilities(cls, host):
+        """Return the capabilities of a backend, cached for the whole run"""
+        client = cls.os_project_admin.volume_capabilities_client_latest
+        return _cached_pool_stats(
+            ('capabilities', host),
+            lambda: client.show_backend_capabilities(host))
+
+    # NOTE: Calls expected to be Forbidden are rejected by the policy check
+    # before the resource is looked at, so they all run against shared
+    # sentinel resources instead of creating and deleting their own. The
+    # sentinels are kept apart from the read-only fixtures, so a policy
+    # regression letting such a call through cannot break other tests.
+
+    def volume_for_request(self, expected_status, client):
+        """Return the ID of a volume to run a volume call against
+
+        Args:
+            expected_status: Expected result of the call
+            client: Client creating the volume when the call is expected
+                to succeed
+        """
+        if expected_status == exceptions.Forbidden:
+            return self.get_shared_volume(purpose='sentinel')
+        return self.create_volume(client=client)
+
+    def snapshot_for_request(self, expected_status, volume_client,
+                             snapshot_client):
+        """Return (volume ID, snapshot ID) to run a snapshot call against
+
+        Args:
+            expected_status: Expected result of the call
+            volume_client: Client creating the volume of the snapshot when
+                the call is expected to succeed
+            snapshot_client: Client creating the snapshot when the call is
+                expected to succeed
+        """
+        if expected_status == exceptions.Forbidden:
+            return (self.get_shared_volume(purpose='sentinel'),
+                    self.get_shared_snapshot(purpose='sentinel'))
+        volume_id = self.create_volume(client=volume_client)
+        return volume_id, self.create_snapshot(
+            client=snapshot_client, volume_id=volume_id)
+
+    def backup_for_request(self, expected_status, volume_client,
+                           backup_client, add_cleanup=True):
+        """Return a backup to run a backup call against
+
+        Args:
+            expected_status: Expected result of the call
+            volume_client: Client creating the volume of the backup when the
+                call is expected to succeed
+            backup_client: Client creating the backup when the call is
+                expected to succeed
+            add_cleanup: Whether a created backup is deleted on cleanup
+        """
+        if expected_status == exceptions.Forbidden:
+            return self.get_shared_backup(purpose='sentinel')
+        volume_id = self.create_volume(client=volume_client)
+        return self.create_backup(
+            volume_id=volume_id, backup_client=backup_client,
+            add_cleanup=add_cleanup
+        )
@@ -25,6 +25,10 @@ CONF = config.CONF
 
 
 class RbacV3BackupsTests(rbac_base.VolumeV3RbacBaseTests):
+    # Classes whose tests modify the class backup get a private one instead
+    # of the backup shared by all the persona classes
+    mutates_backup = False
+
     @classmethod
     def skip_checks(cls):
         super(RbacV3BackupsTests, cls).skip_checks()
@@ -41,10 +45,13 @@ class RbacV3BackupsTests(rbac_base.VolumeV3RbacBaseTests):
     @classmethod
     def resource_setup(cls):
         super(RbacV3BackupsTests, cls).resource_setup()
-        cls.volume_id = cls.create_volume(client=cls.admin_volumes_client)
-        backup = cls.create_backup(
-            volume_id=cls.volume_id, backup_client=cls.admin_backups_client
-        )
+        cls.volume_id = cls.get_shared_volume()
+        if cls.mutates_backup:
+            backup = cls.create_backup(
+                volume_id=cls.volume_id, backup_client=cls.admin_backups_client
+            )
+        else:
+            backup = cls.get_shared_backup()
         cls.backup_id = backup['id']
         cls.backup_name = backup['name']
 
@@ -104,13 +111,9 @@ class RbacV3BackupsTests33(RbacV3BackupsTests):
 
     def _delete_backup(self, expected_status):
         """Delete a backup"""
-        add_cleanup = True if expected_status == exceptions.Forbidden\
-            else False
-        volume_id = self.create_volume(client=self.admin_volumes_client)
-        backup = self.create_backup(
-            volume_id=volume_id,
-            backup_client=self.admin_backups_client,
-            add_cleanup=add_cleanup
+        backup = self.backup_for_request(
+            expected_status, self.admin_volumes_client,
+            self.admin_backups_client, add_cleanup=False
         )
 
         self.do_request(
@@ -159,41 +162,64 @@ class RbacV3BackupsTests33(RbacV3BackupsTests):
             backup_id=self.backup_id
         )
 
-    def _import_backup(self, expected_status):
-        """Import a backup"""
-        volume_id = self.create_volume(client=self.admin_volumes_client)
-        backup = self.create_backup(
-            volume_id=volume_id,
-            backup_client=self.admin_backups_client
-        )
+    @classmethod
+    def get_exported_backup_record(cls):
+        """Return a backup record exported once per project
+
+        The record is only shared across the persona classes with
+        pre-provisioned credentials. With dynamic credentials each class
+        runs in its own project and exports its own backup.
+
+        The exported backup is not the read-only class backup: deleting a
+        backup imported from its record may remove the backup data.
+        """
+        volume_id = cls.get_shared_volume()
+
+        def _export():
+            backup = cls.create_backup(
+                volume_id=volume_id, backup_client=cls.admin_backups_client,
+                add_cleanup=False
+            )
+            record = cls.admin_backups_client.export_backup(
+                backup['id'])['backup-record']
+            waiters.wait_for_volume_resource_status(
+                cls.admin_backups_client, backup['id'], 'available'
+            )
+            return {'backup_id': backup['id'], 'record': record}
 
-        export_backup = (
-            self.admin_backups_client.export_backup(
-                backup['id']
-            )['backup-record']
-        )
-        waiters.wait_for_volume_resource_status(
-            self.admin_backups_client, backup['id'], 'available'
-        )
-        self.assertTrue(
-            export_backup['backup_service'].startswith('cinder.backup.drivers')
-        )
+        return cls.get_shared_fixture(
+            ('exported-backup', volume_id), _export,
+            lambda exported: cls.delete_resource(
+                client=cls.admin_backups_client,
+                backup_id=exported['backup_id'])
+        )['record']
+
+    def _clone_backup_record(self, record):
+        """Mint an importable copy of an exported backup record"""
         # NOTE(ybenshim): Backups are imported with the same backup id
         # (important for incremental backups among other things), so we cannot
         # import the exported backup information as it is, because that Backup
         # ID already exists.  So we'll fake the data by changing the backup id
         # in the exported backup DB info we have retrieved before importing it
         # back.
+        return {
+            'backup_service': record['backup_service'],
+            'backup_url': self._modify_backup_url(
+                record['backup_url'], {'id': data_utils.rand_uuid()}),
+        }
 
-        new_id = data_utils.rand_uuid()
-        new_url = self._modify_backup_url(
-            export_backup['backup_url'], {'id': new_id})
+    def _import_backup(self, expected_status):
+        """Import a backup"""
+        export_backup = self.get_exported_backup_record()
+        self.assertTrue(
+            export_backup['backup_service'].startswith('cinder.backup.drivers')
+        )
+        new_record = self._clone_backup_record(export_backup)
 
         res = self.do_request(
             method='import_backup',
             expected_status=expected_status,
-            backup_service=export_backup['backup_service'],
-            backup_url=new_url
+            **new_record
         )
         if expected_status != exceptions.Forbidden:
             new_backup = res['backup']
@@ -208,10 +234,9 @@ class RbacV3BackupsTests33(RbacV3BackupsTests):
     def _reset_backup_status(self, expected_status):
         """Reset a backup status"""
         new_status = 'error'
-        volume_id = self.create_volume(client=self.admin_volumes_client)
-        backup = self.create_backup(
-            volume_id=volume_id,
-            backup_client=self.admin_backups_client
+        backup = self.backup_for_request(
+            expected_status, self.admin_volumes_client,
+            self.admin_backups_client
         )
 
         self.do_request(
@@ -390,6 +415,7 @@ class ProjectAdminTests33(RbacV3BackupsTests33):
 class RbacV3BackupsTests39(RbacV3BackupsTests):
     """Test API with microversion greater than 3.3"""
     min_microversion = '3.9'
+    mutates_backup = True
 
     def _update_backup(self, expected_status):
         """Update a backup"""
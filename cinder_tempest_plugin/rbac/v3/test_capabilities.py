@@ -29,17 +29,19 @@ class VolumeV3RbacCapabilityTests(rbac_base.VolumeV3RbacBaseTests):
         admin_client = cls.os_project_admin
         cls.admin_capabilities_client = (
             admin_client.volume_capabilities_client_latest)
-        cls.admin_stats_client = (
-            admin_client.volume_scheduler_stats_client_latest)
 
     def _get_capabilities(self, expected_status):
-        pools = self.admin_stats_client.list_pools()['pools']
-        host_name = pools[0]['name']
-        self.do_request(
+        host_name = self.get_pool_host_names()[0]
+        response = self.do_request(
             'show_backend_capabilities',
             expected_status=expected_status,
             host=host_name
         )
+        if response is not None:
+            # The persona must see the backend the admin sees
+            expected = self.get_backend_capabilities(host_name)
+            self.assertEqual(expected['volume_backend_name'],
+                             response['volume_backend_name'])
 
 
 class ProjectReaderTests(VolumeV3RbacCapabilityTests):
@@ -38,10 +38,7 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
-        )
+        self.get_shared_snapshot()
         self.do_request(
             expected_status=expected_status, method='list_snapshots'
         )
@@ -52,10 +49,7 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        snapshot_id = self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
-        )
+        snapshot_id = self.get_shared_snapshot()
         self.do_request(
             expected_status=expected_status, method='show_snapshot',
             snapshot_id=snapshot_id
@@ -95,9 +89,8 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        snapshot_id = self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
+        __, snapshot_id = self.snapshot_for_request(
+            expected_status, self.vol_other_client, self.snap_other_client
         )
 
         self.do_request(
@@ -113,9 +106,8 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        snapshot_id = self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
+        __, snapshot_id = self.snapshot_for_request(
+            expected_status, self.vol_other_client, self.snap_other_client
         )
         self.do_request(
             'reset_snapshot_status', expected_status=expected_status,
@@ -128,9 +120,8 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        snapshot_id = self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
+        __, snapshot_id = self.snapshot_for_request(
+            expected_status, self.vol_other_client, self.snap_other_client
         )
         new_desc = self.__name__ + '-update_test'
         self.do_request(
@@ -170,9 +161,8 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        snapshot_id = self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
+        volume_id, snapshot_id = self.snapshot_for_request(
+            expected_status, self.vol_other_client, self.snap_other_client
         )
         self.do_request(
             method='force_delete_snapshot', snapshot_id=snapshot_id,
@@ -191,9 +181,8 @@ class VolumeV3RbacSnapshotsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
-        snapshot_id = self.create_snapshot(
-            client=self.snap_other_client, volume_id=volume_id
+        __, snapshot_id = self.snapshot_for_request(
+            expected_status, self.vol_other_client, self.snap_other_client
         )
         self.do_request(
             method='unmanage_snapshot',
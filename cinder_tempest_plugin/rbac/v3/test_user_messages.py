@@ -23,7 +23,11 @@ CONF = config.CONF
 
 
 class RbacV3UserMessagesTests(rbac_base.VolumeV3RbacBaseTests):
-    min_microversion = '3.3'
+    # The messages API needs 3.3, filtering the messages by resource 3.5
+    min_microversion = '3.5'
+    # Number of user messages generated in resource_setup: one shared by
+    # the list and show tests, one for the delete test
+    message_pool_size = 2
 
     @classmethod
     def setup_clients(cls):
@@ -33,74 +37,99 @@ class RbacV3UserMessagesTests(rbac_base.VolumeV3RbacBaseTests):
         cls.admin_volumes_client = admin_client.volumes_client_latest
         cls.admin_types_client = admin_client.volume_types_client_latest
 
-    def create_user_message(self):
-        """Trigger a 'no valid host' situation to generate a message."""
+    @classmethod
+    def resource_setup(cls):
+        super(RbacV3UserMessagesTests, cls).resource_setup()
+        cls.message_pool = cls.create_user_messages(cls.message_pool_size)
+        cls.shared_message_id = cls.message_pool.pop()
+
+    @classmethod
+    def _find_user_message(cls, volume_id):
+        """Return the ID of the message generated for a volume, or None"""
+        messages = cls.admin_messages_client.list_messages(
+            resource_uuid=volume_id)['messages']
+        return messages[0]['id'] if messages else None
+
+    @classmethod
+    def create_user_messages(cls, count):
+        """Generate user messages with 'no valid host' situations.
+
+        All the volumes are created before waiting for any of them, so the
+        scheduler fails them concurrently. The messages, volumes and volume
+        type are deleted in the class cleanup.
+
+        Returns:
+            List of the IDs of the generated messages
+        """
         bad_protocol = data_utils.rand_name('storage_protocol')
         bad_vendor = data_utils.rand_name('vendor_name')
         extra_specs = {'storage_protocol': bad_protocol,
                        'vendor_name': bad_vendor}
         vol_type_name = data_utils.rand_name(
-            self.__class__.__name__ + '-volume-type'
+            cls.__name__ + '-volume-type'
         )
-        bogus_type = self.admin_types_client.create_volume_type(
+        bogus_type = cls.admin_types_client.create_volume_type(
             name=vol_type_name, extra_specs=extra_specs
         )['volume_type']
-        self.addCleanup(
-            self.admin_types_client.delete_volume_type, bogus_type['id']
+        cls.addClassResourceCleanup(
+            test_utils.call_and_ignore_notfound_exc,
+            cls.admin_types_client.delete_volume_type, bogus_type['id']
         )
 
         params = {
             'volume_type': bogus_type['id'], 'size': CONF.volume.volume_size
         }
-        volume = self.admin_volumes_client.create_volume(**params)['volume']
-        waiters.wait_for_volume_resource_status(
-            self.admin_volumes_client, volume['id'], 'error'
-        )
-        self.addCleanup(
-            test_utils.call_and_ignore_notfound_exc,
-            self.admin_volumes_client.delete_volume,
-            volume['id']
-        )
+        volume_ids = []
+        for _ in range(count):
+            volume = cls.admin_volumes_client.create_volume(
+                **params)['volume']
+            cls.addClassResourceCleanup(
+                cls.delete_resource, client=cls.admin_volumes_client,
+                volume_id=volume['id']
+            )
+            volume_ids.append(volume['id'])
 
-        messages = self.admin_messages_client.list_messages()['messages']
-        message_id = None
-        for message in messages:
-            if message['resource_uuid'] == volume['id']:
-                message_id = message['id']
-                break
-        self.assertIsNotNone(
-            message_id, f"No user message generated for volume {volume['id']}"
-        )
-        return message_id
+        message_ids = []
+        for volume_id in volume_ids:
+            waiters.wait_for_volume_resource_status(
+                cls.admin_volumes_client, volume_id, 'error'
+            )
+            message_id = cls._find_user_message(volume_id)
+            if message_id is None:
+                raise exceptions.TempestException(
+                    f"No user message generated for volume {volume_id}"
+                )
+            cls.addClassResourceCleanup(
+                test_utils.call_and_ignore_notfound_exc,
+                cls.admin_messages_client.delete_message, message_id
+            )
+            message_ids.append(message_id)
+        return message_ids
+
+    def get_user_message(self):
+        """Hand out a message from the pool, generating one if it is empty"""
+        if self.message_pool:
+            return self.message_pool.pop()
+        return self.create_user_messages(1)[0]
 
     def _list_messages(self, expected_status):
-        message_id = self.create_user_message()
-        self.addCleanup(
-            self.admin_messages_client.delete_message, message_id
-        )
         self.do_request(
             method='list_messages', expected_status=expected_status
         )
 
     def _show_message(self, expected_status):
-        message_id = self.create_user_message()
-        self.addCleanup(self.admin_messages_client.delete_message, message_id)
         self.do_request(
             method='show_message', expected_status=expected_status,
-            message_id=message_id
+            message_id=self.shared_message_id
         )
 
     def _delete_message(self, expected_status):
-        message_id = self.create_user_message()
+        message_id = self.get_user_message()
         self.do_request(
             method='delete_message', expected_status=expected_status,
             message_id=message_id
         )
-        if expected_status == exceptions.Forbidden:
-            self.addCleanup(
-                self.admin_messages_client.delete_message, message_id
-            )
-        else:
+        if expected_status != exceptions.Forbidden:
             self.client.wait_for_resource_deletion(id=message_id)
 
 
@@ -32,7 +32,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='extend_volume', volume_id=volume_id,
             new_size=2, expected_status=expected_status
@@ -44,7 +46,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='reset_volume_status', volume_id=volume_id,
             status='error', expected_status=expected_status
@@ -56,7 +60,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='retype_volume', volume_id=volume_id,
             new_type='dedup-tier-replication', expected_status=expected_status
@@ -68,7 +74,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='update_volume_readonly', volume_id=volume_id,
             readonly=True, expected_status=expected_status
@@ -80,7 +88,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='force_delete_volume', volume_id=volume_id,
             expected_status=expected_status
@@ -92,7 +102,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='reserve_volume', volume_id=volume_id,
             expected_status=expected_status
@@ -104,7 +116,9 @@ class VolumeV3RbacVolumeActionsTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='unreserve_volume', volume_id=volume_id,
             expected_status=expected_status
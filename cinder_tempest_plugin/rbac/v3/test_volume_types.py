@@ -10,7 +10,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from concurrent import futures
+
 from tempest.lib.common.utils import data_utils
+from tempest.lib.common.utils import test_utils
 from tempest.lib import decorators
 from tempest.lib import exceptions
 
@@ -46,6 +49,11 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
         'control_location': 'front-end'
     }
 
+    # Number of spare volume types built in resource_setup, matching the
+    # tests which need a volume type of their own
+    spare_encrypted_types = 1
+    spare_plain_types = 4
+
     @classmethod
     def setup_clients(cls):
         super().setup_clients()
@@ -57,10 +65,19 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
 
     @classmethod
     def resource_setup(cls):
-        """Create a new volume-type for the test"""
+        """Create the volume types for the test"""
         super(RbacV3VolumeTypesTests, cls).resource_setup()
-        # create a volume type
-        cls.volume_type = cls.create_volume_type()
+        # Build the shared volume type together with the spare ones the
+        # mutating tests consume, see get_spare_volume_type
+        volume_types = cls.create_volume_types(
+            [True] * (1 + cls.spare_encrypted_types) +
+            [False] * cls.spare_plain_types
+        )
+        cls.volume_type = volume_types.pop(0)
+        cls.spare_volume_types = {True: [], False: []}
+        for volume_type in volume_types:
+            cls.spare_volume_types['encryption_id' in volume_type].append(
+                volume_type)
 
     @classmethod
     def create_volume_type(
@@ -76,23 +93,56 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
         volume_type = cls.admin_types_client.create_volume_type(
             **params
         )['volume_type']
+        if cleanup:
+            cls.addClassResourceCleanup(
+                test_utils.call_and_ignore_notfound_exc,
+                cls.admin_types_client.delete_volume_type, volume_type['id']
+            )
 
         if with_encryption:
             # Create encryption_type
-            cls.encryption_type = \
+            encryption_type = \
                 cls.admin_encryption_types_client.create_encryption_type(
                     volume_type['id'], **cls.create_kwargs)['encryption']
             # NOTE: strictly speaking, this is NOT a volume_type field;
             # we save it for convenience in these tests
-            volume_type['encryption_id'] = cls.encryption_type['encryption_id']
-
-        if cleanup:
-            cls.addClassResourceCleanup(
-                cls.admin_types_client.delete_volume_type, volume_type['id']
-            )
+            volume_type['encryption_id'] = encryption_type['encryption_id']
 
         return volume_type
 
+    @classmethod
+    def create_volume_types(cls, with_encryption, cleanup=True):
+        """Create several volume types at once
+
+        The extra specs are part of the volume type creation and only the
+        encryption type depends on it, so every type is built in its own
+        thread and the types are built concurrently.
+
+        Args:
+            with_encryption: One boolean per volume type to create, telling
+                whether it gets an encryption type
+            cleanup: Whether to delete the volume types on class cleanup
+
+        Returns:
+            The volume types, in the order of with_encryption
+        """
+        with futures.ThreadPoolExecutor(len(with_encryption)) as executor:
+            return list(executor.map(
+                lambda encrypted: cls.create_volume_type(
+                    with_encryption=encrypted, cleanup=cleanup),
+                with_encryption))
+
+    def get_spare_volume_type(self, with_encryption):
+        """Return a volume type the test may modify or delete
+
+        Spare volume types are built in resource_setup, a new one is only
+        created once they are used up.
+        """
+        spares = self.spare_volume_types[with_encryption]
+        if spares:
+            return spares.pop()
+        return self.create_volume_type(with_encryption=with_encryption)
+
     def _extra_specs_content_validator(self, client, extra_specs):
         """Validation of volume type's extra specs content
 
@@ -126,7 +176,7 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
 
     def _create_or_update_extra_specs_for_volume_type(self, expected_status):
         """Create or update extra specs"""
-        volume_type = self.create_volume_type(with_encryption=False)
+        volume_type = self.get_spare_volume_type(with_encryption=False)
         # Create extra spec 'key2' with value 'value2'
         extra_spec = {'key2': 'value2'}
         self.do_request(
@@ -217,7 +267,7 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
 
     def _delete_extra_spec_for_volume_type(self, expected_status):
         """Delete a volume type extra_spec"""
-        volume_type = self.create_volume_type(with_encryption=False)
+        volume_type = self.get_spare_volume_type(with_encryption=False)
 
         self.do_request(
             method='delete_volume_type_extra_specs',
@@ -248,11 +298,7 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
 
     def _delete_volume_type(self, expected_status):
         """Delete a volume type"""
-        cleanup = True if expected_status == exceptions.Forbidden\
-            else False
-        volume_type = self.create_volume_type(
-            with_encryption=False, cleanup=cleanup
-        )
+        volume_type = self.get_spare_volume_type(with_encryption=False)
 
         self.do_request(
             method='delete_volume_type',
@@ -306,7 +352,7 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
 
     def _delete_encryption_type(self, expected_status):
         """Delete encryption type"""
-        volume_type = self.create_volume_type(with_encryption=True)
+        volume_type = self.get_spare_volume_type(with_encryption=True)
 
         self.do_request(
             method='delete_encryption_type',
@@ -318,7 +364,7 @@ class RbacV3VolumeTypesTests(rbac_base.VolumeV3RbacBaseTests):
 
     def _create_encryption_type(self, expected_status):
         """Create encryption type"""
-        volume_type = self.create_volume_type(with_encryption=False)
+        volume_type = self.get_spare_volume_type(with_encryption=False)
 
         self.do_request(
             method='create_encryption_type',
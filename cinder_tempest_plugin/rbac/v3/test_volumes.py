@@ -45,7 +45,7 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.get_shared_volume()
         self.do_request(
             method='show_volume', volume_id=volume_id,
             expected_status=expected_status
@@ -57,7 +57,7 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        self.create_volume(client=self.vol_other_client)
+        self.get_shared_volume()
         self.do_request(method='list_volumes', expected_status=expected_status)
 
     def _list_volumes_detail(self, expected_status):
@@ -66,7 +66,7 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        self.create_volume(client=self.vol_other_client)
+        self.get_shared_volume()
         self.do_request(
             method='list_volumes', detail=True, expected_status=expected_status
         )
@@ -77,7 +77,7 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        self.create_volume(client=self.vol_other_client)
+        self.get_shared_volume()
         self.do_request(
             method='show_volume_summary', expected_status=expected_status
         )
@@ -88,7 +88,9 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         new_desc = self.__name__ + '-update_test'
         self.do_request(
             method='update_volume', volume_id=volume_id, description=new_desc,
@@ -101,7 +103,9 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='set_bootable_volume', volume_id=volume_id,
             bootable=True, expected_status=expected_status
@@ -113,7 +117,9 @@ class VolumeV3RbacVolumesTests(rbac_base.VolumeV3RbacBaseTests):
         Args:
             expected_status: The expected HTTP response code
         """
-        volume_id = self.create_volume(client=self.vol_other_client)
+        volume_id = self.volume_for_request(
+            expected_status, client=self.vol_other_client
+        )
         self.do_request(
             method='delete_volume', volume_id=volume_id,
             expected_status=expected_status
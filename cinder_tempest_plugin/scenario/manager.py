@@ -17,14 +17,21 @@ import contextlib
 
 from oslo_log import log
 
+from tempest.common import compute
 from tempest.common import waiters
 from tempest import config
+from tempest.lib.common import rest_client
 from tempest.lib.common.utils import data_utils
 from tempest.lib.common.utils import test_utils
+from tempest.lib.common import validation_resources as vr
 from tempest.lib import exceptions as lib_exc
 
 from tempest.scenario import manager
 
+from cinder_tempest_plugin.common import instrumentation
+from cinder_tempest_plugin.common import profiling
+from cinder_tempest_plugin.common import tracing
+
 CONF = config.CONF
 
 LOG = log.getLogger(__name__)
@@ -34,15 +41,210 @@ class ScenarioTest(manager.ScenarioTest):
 
     credentials = ['primary', 'admin']
 
+    # Set to True in test classes whose tests can run on servers leased
+    # from a pool booted once per class, see create_or_lease_server
+    uses_server_pool = False
+
+    def setUp(self):
+        super(ScenarioTest, self).setUp()
+        profiling.profile_test(self)
+
     @classmethod
     def setup_clients(cls):
         super(ScenarioTest, cls).setup_clients()
         cls.admin_volume_types_client = cls.os_admin.volume_types_client_latest
+        # Time the calls of the tempest clients too, which also tags the
+        # spans of the traced helpers with their request IDs
+        for client in list(vars(cls).values()):
+            if isinstance(client, rest_client.RestClient):
+                instrumentation.instrument(client)
+
+    @classmethod
+    def resource_setup(cls):
+        super(ScenarioTest, cls).resource_setup()
+        cls._server_pool = []
+        cls._server_pool_resources = None
+        if cls.uses_server_pool and CONF.volume.server_pool_size > 0:
+            cls._boot_server_pool(CONF.volume.server_pool_size)
+
+    @classmethod
+    def _boot_server_pool(cls, size):
+        """Boot size servers for the tests of this class to lease.
+
+        All the boot requests are sent before waiting for any server, so
+        the servers build in parallel. Every server shares a keypair and a
+        security group allowing SSH, and gets its own floating IP when
+        `[validation] connect_method` is 'floating'.
+        """
+        if cls._server_pool_resources is None:
+            cls._server_pool_resources = vr.create_validation_resources(
+                cls.os_primary, keypair=True, security_group=True,
+                security_group_rules=True,
+                ethertype='IPv' + str(CONF.validation.ip_version_for_ssh),
+                use_neutron=CONF.service_available.neutron)
+            cls.addClassResourceCleanup(
+                vr.clear_validation_resources, cls.os_primary,
+                use_neutron=CONF.service_available.neutron,
+                **cls._server_pool_resources)
+        keypair = cls._server_pool_resources['keypair']
+        security_group = cls._server_pool_resources['security_group']
+
+        servers = []
+        for _ in range(size):
+            server, _ = compute.create_test_server(
+                cls.os_primary,
+                tenant_network=cls.get_tenant_network(),
+                name=data_utils.rand_name(cls.__name__ + '-pool-server'),
+                key_name=keypair['name'],
+                security_groups=[{'name': security_group['name']}],
+                wait_until=None)
+            cls.addClassResourceCleanup(
+                test_utils.call_and_ignore_notfound_exc,
+                waiters.wait_for_server_termination,
+                cls.os_primary.servers_client, server['id'])
+            cls.addClassResourceCleanup(
+                test_utils.call_and_ignore_notfound_exc,
+                cls.os_primary.servers_client.delete_server, server['id'])
+            servers.append(server)
+
+        for server in servers:
+            waiters.wait_for_server_status(cls.os_primary.servers_client,
+                                           server['id'], 'ACTIVE')
+            server = cls.os_primary.servers_client.show_server(
+                server['id'])['server']
+            entry = {'server': server, 'keypair': keypair, 'ip': None}
+            if CONF.validation.connect_method == 'floating':
+                fip = vr.create_validation_resources(
+                    cls.os_primary, floating_ip=True,
+                    use_neutron=CONF.service_available.neutron,
+                    floating_network_id=CONF.network.public_network_id,
+                    floating_network_name=CONF.network.floating_network_name
+                )['floating_ip']
+                cls.addClassResourceCleanup(
+                    vr.clear_validation_resources, cls.os_primary,
+                    floating_ip=fip,
+                    use_neutron=CONF.service_available.neutron)
+                port = cls.os_primary.ports_client.list_ports(
+                    device_id=server['id'])['ports'][0]
+                cls.os_primary.floating_ips_client.update_floatingip(
+                    fip['id'], port_id=port['id'])
+                entry['ip'] = fip['floating_ip_address']
+            cls._server_pool.append(entry)
+
+    def _server_is_healthy(self, entry):
+        """Check a pool server is ACTIVE, has no volume and answers SSH."""
+        server_id = entry['server']['id']
+        try:
+            server = self.servers_client.show_server(server_id)['server']
+            if server['status'] != 'ACTIVE':
+                return False
+            attachments = self.servers_client.list_volume_attachments(
+                server_id)['volumeAttachments']
+            if attachments:
+                return False
+            self.get_remote_client(
+                entry['ip'], private_key=entry['keypair']['private_key'],
+                server=server)
+        except Exception:
+            LOG.exception('Pool server %s failed its health check',
+                          server_id)
+            return False
+        return True
+
+    def _release_server(self, entry):
+        """Return a leased server to the pool, or recycle it if unhealthy."""
+        if self._server_is_healthy(entry):
+            self._server_pool.append(entry)
+            return
+        LOG.warning('Replacing unhealthy pool server %s',
+                    entry['server']['id'])
+        test_utils.call_and_ignore_notfound_exc(
+            self.servers_client.delete_server, entry['server']['id'])
+
+    @tracing.traced()
+    def create_or_lease_server(self, keypair=None, **kwargs):
+        """Return an SSH reachable server for attach/detach workflows.
+
+        If the class sets uses_server_pool and `[volume] server_pool_size`
+        is set, the server is leased from the class pool and returned to it
+        once the test cleanups have detached its volumes; servers failing
+        their health check are replaced. Otherwise a new server is booted
+        with create_server(**kwargs).
+
+        :param keypair: optional keypair used when booting a new server.
+        :returns: a (server, ip address, keypair) tuple. The keypair is the
+            one the server was booted with, which for leased servers is the
+            pool keypair rather than the one given.
+        """
+        if not (self.uses_server_pool and CONF.volume.server_pool_size > 0):
+            kwargs.setdefault('wait_until', 'SSHABLE')
+            if keypair:
+                kwargs['key_name'] = keypair['name']
+            server = self.create_server(**kwargs)
+            tracing.set_attribute('nova.server.id', server['id'])
+            return server, self.get_server_ip(server), keypair
+
+        if not self._server_pool:
+            self._boot_server_pool(1)
+        entry = self._server_pool.pop(0)
+        if entry['ip'] is None:
+            entry['ip'] = self.get_server_ip(entry['server'])
+        # Wait for the guest to answer SSH before handing it out
+        self.get_remote_client(
+            entry['ip'], private_key=entry['keypair']['private_key'],
+            server=entry['server'])
+        # Registered first so it runs after the detach cleanups
+        self.addCleanup(self._release_server, entry)
+        tracing.set_attribute('nova.server.id', entry['server']['id'])
+        tracing.set_attribute('cinder.server_pool.leased', True)
+        return entry['server'], entry['ip'], entry['keypair']
+
+    def _watch_for_new_disk(self, ssh, disks_list_before_attach):
+        """Wait in the guest for a disk not in disks_list_before_attach.
+
+        A single remote command loops over the kernel's view of the block
+        devices and prints the first new disk, so the device is reported as
+        soon as it shows up instead of on the next build_interval poll.
+        On timeout it prints the disks it last saw after a "timeout" word.
+        """
+        watch_command = (
+            "end=$(( $(date +%%s) + %(timeout)d )); "
+            "while [ $(date +%%s) -lt $end ]; do "
+            "disks=$(lsblk -lb --nodeps | awk '$6 == \"disk\" "
+            "{print $1}'); "
+            "for d in $disks; do "
+            "case ' %(known)s ' in *\" $d \"*) ;; "
+            "*) echo $d; exit 0;; esac; "
+            "done; "
+            "sleep 0.1 2>/dev/null || sleep 1; "
+            "done; echo timeout $disks" %
+            {'timeout': CONF.compute.build_timeout,
+             'known': ' '.join(disks_list_before_attach)})
+        server = ssh.server['id'] if ssh.server else ssh.ip_address
+        try:
+            output = ssh.exec_command("sh -c '%s'" %
+                                      watch_command.replace("'", "'\\''"))
+        except lib_exc.SSHExecCommandFailed as exc:
+            raise lib_exc.TimeoutException(
+                'Failed to watch for a new disk on server %s, disks before '
+                'the attachment: %s' % (server, disks_list_before_attach)
+            ) from exc
+        output = output.split()
+        if output[:1] == ['timeout']:
+            raise lib_exc.TimeoutException(
+                'No new disk showed up on server %s within %s s, disks '
+                'before the attachment: %s, disks seen: %s' %
+                (server, CONF.compute.build_timeout,
+                 disks_list_before_attach, output[1:]))
+        return output[0]
 
     def _attached_volume_name(
             self, disks_list_before_attach, ip_address, private_key):
         ssh = self.get_remote_client(ip_address, private_key=private_key)
 
+        if CONF.volume.disk_discovery_mode == 'watch':
+            return self._watch_for_new_disk(ssh, disks_list_before_attach)
+
         def _wait_for_volume_available_on_system():
             disks_list_after_attach = ssh.list_disks()
             return len(disks_list_after_attach) > len(disks_list_before_attach)
@@ -98,6 +300,7 @@ class ScenarioTest(manager.ScenarioTest):
 
         ssh_client.make_fs(dev_name, fs=fs)
 
+    @tracing.traced()
     def create_md5_new_file(self, ip_address, filename, dev_name=None,
                             mount_path='/mnt', private_key=None, server=None):
         ssh_client = self.get_remote_client(ip_address,
@@ -112,6 +315,7 @@ class ScenarioTest(manager.ScenarioTest):
                 'sudo md5sum -b %s/%s|cut -c 1-32' % (mount_path, filename))
         return md5
 
+    @tracing.traced()
     def get_md5_from_file(self, instance, instance_ip, filename,
                           dev_name=None):
 
@@ -124,12 +328,94 @@ class ScenarioTest(manager.ScenarioTest):
                                   server=instance)
         return count, md5_sum
 
+    def _block_digests_command(self, dev, bs, count, block_size):
+        """Build a guest command printing one sha1sum per block_size bytes.
+
+        The region covered is the first bs * count bytes of dev, the same
+        one read and written by read_data_from_device and
+        write_data_to_device. Every block is copied to a temporary file
+        before it is hashed, so a failed read fails the command instead of
+        hashing partial data.
+
+        :returns: the command and the number of digests it prints.
+        """
+        if block_size % bs:
+            raise ValueError('block_size (%s) must be a multiple of bs (%s)'
+                             % (block_size, bs))
+        per_block = block_size // bs
+        block_count = -(-count // per_block)
+        return (
+            '{ f=$(mktemp) || exit 1; '
+            'i=0; while [ $i -lt %(blocks)d ]; do '
+            'c=%(per_block)d; r=$(( %(count)d - i * %(per_block)d )); '
+            'if [ $r -lt $c ]; then c=$r; fi; '
+            'sudo dd bs=%(bs)d skip=$(( i * %(per_block)d )) count=$c '
+            'if=%(dev)s of=$f 2>/dev/null || { rm -f $f; exit 1; }; '
+            'sha1sum $f | head -c 40; echo; '
+            'i=$(( i + 1 )); done; rm -f $f; }' %
+            {'blocks': block_count, 'per_block': per_block, 'count': count,
+             'bs': bs, 'dev': dev}), block_count
+
+    def _exec_block_digests(self, ssh_client, command, block_count):
+        digests = ssh_client.exec_command(command).split()
+        self.assertEqual(block_count, len(digests),
+                         'Unexpected number of block digests')
+        return digests
+
+    def assert_block_digests_equal(self, expected, actual, block_size,
+                                   message=None):
+        """Compare two block digest lists and report the offending ranges.
+
+        :param expected: digest list returned by write_data_to_device or
+            read_data_from_device with the same block_size.
+        :param actual: digest list to verify against expected.
+        :param block_size: size in bytes of the block each digest covers.
+        :param message: optional context prefixed to the failure message.
+        """
+        self.assertEqual(len(expected), len(actual),
+                         'Block digest lists have different lengths')
+        bad_ranges = []
+        for index, (want, got) in enumerate(zip(expected, actual)):
+            if want == got:
+                continue
+            start = index * block_size
+            if bad_ranges and bad_ranges[-1][1] == start:
+                bad_ranges[-1][1] = start + block_size
+            else:
+                bad_ranges.append([start, start + block_size])
+        if bad_ranges:
+            self.fail('%sData mismatch in byte ranges: %s' % (
+                '%s: ' % message if message else '',
+                ', '.join('[%d, %d)' % (start, end)
+                          for start, end in bad_ranges)))
+
+    @tracing.traced()
     def write_data_to_device(self, ip_address, out_dev, in_dev='/dev/urandom',
                              bs=1024, count=100, private_key=None,
-                             server=None, sha_sum=False):
+                             server=None, sha_sum=False, block_size=None):
+        """Write bs * count bytes from in_dev to out_dev and read them back.
+
+        By default the raw data read back is returned. With sha_sum the
+        sha1sum of the whole region is returned instead, and with
+        block_size a list with the sha1sum of every block_size bytes of the
+        region, computed in the guest, is returned.
+        """
         ssh_client = self.get_remote_client(
             ip_address, private_key=private_key, server=server)
 
+        if block_size:
+            digests_command, block_count = self._block_digests_command(
+                out_dev, bs, count, block_size)
+            # The digests command is a single group, so it only runs once
+            # the write succeeded
+            write_command = (
+                'sudo dd bs=%(bs)s count=%(count)s if=%(in_dev)s '
+                'of=%(out_dev)s && %(digests)s' %
+                {'bs': str(bs), 'count': str(count), 'in_dev': in_dev,
+                 'out_dev': out_dev, 'digests': digests_command})
+            return self._exec_block_digests(ssh_client, write_command,
+                                            block_count)
+
         # Write data to device
         write_command = (
             'sudo dd bs=%(bs)s count=%(count)s if=%(in_dev)s of=%(out_dev)s '
@@ -143,11 +429,23 @@ class ScenarioTest(manager.ScenarioTest):
 
         return data
 
+    @tracing.traced()
     def read_data_from_device(self, ip_address, in_dev, bs=1024, count=100,
-                              private_key=None, server=None, sha_sum=False):
+                              private_key=None, server=None, sha_sum=False,
+                              block_size=None):
+        """Read bs * count bytes from in_dev.
+
+        Returns the raw data, its sha1sum with sha_sum, or the list of
+        per-block sha1sums with block_size (see write_data_to_device).
+        """
         ssh_client = self.get_remote_client(
             ip_address, private_key=private_key, server=server)
 
+        if block_size:
+            return self._exec_block_digests(
+                ssh_client, *self._block_digests_command(
+                    in_dev, bs, count, block_size))
+
         # Read data from device
         read_command = ('sudo dd bs=%(bs)s count=%(count)s if=%(in_dev)s' %
                         {'bs': bs, 'count': count, 'in_dev': in_dev})
@@ -158,6 +456,7 @@ class ScenarioTest(manager.ScenarioTest):
 
         return data
 
+    @tracing.traced()
     def _attach_and_get_volume_device_name(self, server, volume, instance_ip,
                                            private_key):
         ssh_client = self.get_remote_client(
@@ -173,6 +472,93 @@ class ScenarioTest(manager.ScenarioTest):
             disks_list_before_attach, instance_ip, private_key)
         return volume_device_name, attachment
 
+    def _attached_volumes_names(self, disks_list_before_attach, volumes,
+                                ip_address, private_key):
+        """Map each of the given freshly attached volumes to its device.
+
+        Virtio disks expose the first 20 characters of the volume ID as
+        their serial, which is used to tell the new devices apart. Devices
+        without a usable serial are matched to the volumes in attach order.
+        """
+        ssh = self.get_remote_client(ip_address, private_key=private_key)
+
+        def _wait_for_volumes_available_on_system():
+            disks_list_after_attach = ssh.list_disks()
+            return (len(disks_list_after_attach) >=
+                    len(disks_list_before_attach) + len(volumes))
+
+        if not test_utils.call_until_true(
+                _wait_for_volumes_available_on_system,
+                CONF.compute.build_timeout,
+                CONF.compute.build_interval):
+            raise lib_exc.TimeoutException
+
+        new_disks = sorted(
+            [item for item in ssh.list_disks()
+             if item not in disks_list_before_attach],
+            key=lambda name: (len(name), name))
+        serials = ssh.exec_command(
+            'for d in %s; do echo "$d $(cat /sys/block/$d/serial '
+            '2>/dev/null)"; done' % ' '.join(new_disks))
+        serial_map = {}
+        for line in serials.splitlines():
+            fields = line.split()
+            if len(fields) == 2:
+                serial_map[fields[1]] = fields[0]
+
+        device_names = {}
+        for volume in volumes:
+            device = serial_map.get(volume['id'][:20])
+            if device:
+                device_names[volume['id']] = device
+        unmatched_disks = [d for d in new_disks
+                           if d not in device_names.values()]
+        for volume in volumes:
+            if volume['id'] not in device_names:
+                device_names[volume['id']] = unmatched_disks.pop(0)
+        return device_names
+
+    @tracing.traced()
+    def attach_volumes(self, server, volumes):
+        """Attach several volumes to a server at once.
+
+        All attach requests are issued before waiting for any of the volumes
+        to become 'in-use'. The volumes will be detached when the test tears
+        down. Multiattach volumes must go through attach_volume.
+
+        :param server: The server to which the volumes will be attached.
+        :param volumes: The volumes to attach.
+        :returns: the list of attachments, in the order of volumes.
+        """
+        tracing.set_attribute('nova.server.id', server['id'])
+        tracing.set_attribute('cinder.volume.ids',
+                              [volume['id'] for volume in volumes])
+        attachments = []
+        for volume in volumes:
+            attachments.append(self.servers_client.attach_volume(
+                server['id'], volumeId=volume['id'])['volumeAttachment'])
+            self.addCleanup(waiters.wait_for_volume_resource_status,
+                            self.volumes_client, volume['id'], 'available')
+            self.addCleanup(self._detach_volume, server, volume)
+        for volume in volumes:
+            waiters.wait_for_volume_resource_status(self.volumes_client,
+                                                    volume['id'], 'in-use')
+        return attachments
+
+    @tracing.traced()
+    def _attach_and_get_volumes_device_names(self, server, volumes,
+                                             instance_ip, private_key):
+        """Attach volumes at once and return {volume id: device name}."""
+        ssh_client = self.get_remote_client(
+            instance_ip, private_key=private_key,
+            server=server)
+        disks_list_before_attach = ssh_client.list_disks()
+        attachments = self.attach_volumes(server, volumes)
+        device_names = self._attached_volumes_names(
+            disks_list_before_attach, volumes, instance_ip, private_key)
+        return device_names, attachments
+
+    @tracing.traced(resource_kind='cinder.volume_type')
     def create_volume_type(self, client=None, name=None, extra_specs=None):
         if not client:
             client = self.os_admin.volume_types_client_latest
@@ -190,6 +576,62 @@ class ScenarioTest(manager.ScenarioTest):
         self.addCleanup(self.cleanup_volume_type, volume_type)
         return volume_type
 
+    @classmethod
+    def get_shared_volume_type(cls, extra_specs=None, encryption=None):
+        """Return a volume type shared by the tests of this class.
+
+        Types are cached per test class, keyed by their extra specs and
+        encryption parameters, and deleted once in the class teardown.
+        Tests must not modify the type they get, use create_volume_type
+        for that.
+
+        :param extra_specs: extra specs of the volume type.
+        :param encryption: optional encryption type parameters (provider,
+            key_size, cipher and control_location).
+        """
+        extra_specs = extra_specs or {}
+        key = (tuple(sorted(extra_specs.items())),
+               tuple(sorted((encryption or {}).items())))
+        # Look up the cache on the class itself, so that subclasses, which
+        # run with other credentials, don't share their parent's types
+        cache = cls.__dict__.get('_shared_volume_types')
+        if cache is None:
+            cache = cls._shared_volume_types = {}
+        if key in cache:
+            return cache[key]
+
+        name = data_utils.rand_name('scenario-type-' + cls.__name__)
+        LOG.debug("Creating a shared volume type: %s with extra_specs %s",
+                  name, extra_specs)
+        volume_type = cls.admin_volume_types_client.create_volume_type(
+            name=name, extra_specs=extra_specs)['volume_type']
+        cls.addClassResourceCleanup(cls._cleanup_shared_volume_type,
+                                    volume_type)
+        if encryption:
+            cls.os_admin.encryption_types_client_latest.create_encryption_type(
+                volume_type['id'], **encryption)
+        cache[key] = volume_type
+        return volume_type
+
+    @classmethod
+    def _cleanup_shared_volume_type(cls, volume_type):
+        # Same as cleanup_volume_type, but usable from the class teardown
+        admin_volumes_client = cls.os_admin.volumes_client_latest
+        volumes = admin_volumes_client.list_volumes(
+            detail=True, params={'all_tenants': 1})['volumes']
+        for volume in [v for v in volumes
+                       if v['volume_type'] == volume_type['name']]:
+            test_utils.call_and_ignore_notfound_exc(
+                admin_volumes_client.delete_volume, volume['id'])
+            admin_volumes_client.wait_for_resource_deletion(volume['id'])
+        test_utils.call_and_ignore_notfound_exc(
+            cls.os_admin.encryption_types_client_latest.delete_encryption_type,
+            volume_type['id'])
+        test_utils.call_and_ignore_notfound_exc(
+            cls.admin_volume_types_client.delete_volume_type,
+            volume_type['id'])
+
+    @tracing.traced()
     def attach_volume(self, server, volume, device=None, tag=None):
         """Attaches volume to server and waits for 'in-use' volume status.
 
@@ -201,6 +643,8 @@ class ScenarioTest(manager.ScenarioTest):
             this is not guaranteed for all hypervisors and is not recommended.
         :param tag: Optional device role tag to apply to the volume.
         """
+        tracing.set_attribute('nova.server.id', server['id'])
+        tracing.set_attribute('cinder.volume.id', volume['id'])
         attach_kwargs = dict(volumeId=volume['id'])
         if device:
             attach_kwargs['device'] = device
@@ -229,12 +673,15 @@ class ScenarioTest(manager.ScenarioTest):
         self.addCleanup(self._detach_volume, server, volume)
         return attachment
 
+    @tracing.traced()
     def _detach_volume(self, server, volume):
         """Helper method to detach a volume.
 
         Ignores 404 responses if the volume or server do not exist, or the
         volume is already detached from the server.
         """
+        tracing.set_attribute('nova.server.id', server['id'])
+        tracing.set_attribute('cinder.volume.id', volume['id'])
         try:
             volume = self.volumes_client.show_volume(volume['id'])['volume']
             # Check the status. You can only detach an in-use volume, otherwise
@@ -19,10 +19,13 @@ from tempest import config
 from tempest.lib import decorators
 from tempest.scenario import manager
 
+from cinder_tempest_plugin.scenario import manager as cinder_manager
+
 CONF = config.CONF
 
 
-class TransferEncryptedVolumeTest(manager.EncryptionScenarioTest):
+class TransferEncryptedVolumeTest(manager.EncryptionScenarioTest,
+                                  cinder_manager.ScenarioTest):
 
     volume_min_microversion = '3.70'
     volume_max_microversion = 'latest'
@@ -52,12 +55,11 @@ class TransferEncryptedVolumeTest(manager.EncryptionScenarioTest):
         self.security_group = self.create_security_group()
 
     def _create_encrypted_volume_from_image(self):
-        volume_type = self.create_volume_type()
-        self.create_encryption_type(type_id=volume_type['id'],
-                                    provider='luks',
-                                    key_size=256,
-                                    cipher='aes-xts-plain64',
-                                    control_location='front-end')
+        volume_type = self.get_shared_volume_type(
+            encryption={'provider': 'luks',
+                        'key_size': 256,
+                        'cipher': 'aes-xts-plain64',
+                        'control_location': 'front-end'})
         return self.create_volume_from_image(volume_type=volume_type['id'])
 
     def _create_or_get_timestamp(self, volume, timestamp_fn):
@@ -27,6 +27,8 @@ CONF = config.CONF
 
 class SnapshotDataIntegrityTests(manager.ScenarioTest):
 
+    uses_server_pool = True
+
     def setUp(self):
         super(SnapshotDataIntegrityTests, self).setUp()
         self.validation_resources = self.get_test_validation_resources(
@@ -51,26 +53,25 @@ class SnapshotDataIntegrityTests(manager.ScenarioTest):
            on it and mount it
         3) Create a file and write data into it, Unmount it
         4) create snapshot
-        5) repeat 3 and 4 two more times (simply creating 3 snapshots)
+        5) repeat 3 and 4 until `[volume] snapshot_integrity_count` snapshots
+           have been created (3 by default)
 
-        Now create volume from the snapshots one by one, attach it to the
-        instance and check the number of files and file content at each
-        point when snapshot was created.
+        Now create volumes from all the snapshots at once, attach them all
+        to the instance and check the number of files and file content at
+        each point when snapshot was created.
         """
+        snapshot_count = CONF.volume.snapshot_integrity_count
 
-        # Create an instance
-        server = self.create_server(
-            key_name=self.keypair['name'],
+        # Create an instance, or lease one from the class server pool
+        server, instance_ip, self.keypair = self.create_or_lease_server(
+            self.keypair,
             validatable=True,
             validation_resources=self.validation_resources,
-            wait_until='SSHABLE',
             security_groups=[{'name': self.security_group['name']}])
 
         # Create an empty volume
         volume = self.create_volume()
 
-        instance_ip = self.get_server_ip(server)
-
         # Attach volume to instance and find it's device name (eg: /dev/vdb)
         volume_device_name, __ = self._attach_and_get_volume_device_name(
             server, volume, instance_ip, self.keypair['private_key'])
@@ -79,51 +80,42 @@ class SnapshotDataIntegrityTests(manager.ScenarioTest):
         self._make_fs(instance_ip, self.keypair['private_key'], server,
                       volume_device_name)
 
-        # Write data to volume
-        file1_md5 = self.create_md5_new_file(
-            instance_ip, dev_name=volume_device_name, filename="file1",
-            private_key=self.keypair['private_key'],
-            server=instance_ip)
-
-        # Create first snapshot
-        snapshot1 = self.create_volume_snapshot(volume['id'], force=True)
-
-        # Write data to volume
-        file2_md5 = self.create_md5_new_file(
-            instance_ip, dev_name=volume_device_name, filename="file2",
-            private_key=self.keypair['private_key'],
-            server=instance_ip)
+        snap_map = {}
+        file_map = {}
+        for i in range(1, snapshot_count + 1):
+            # Write data to volume
+            file_map[i] = self.create_md5_new_file(
+                instance_ip, dev_name=volume_device_name,
+                filename='file' + str(i),
+                private_key=self.keypair['private_key'],
+                server=instance_ip)
 
-        # Create second snapshot
-        snapshot2 = self.create_volume_snapshot(volume['id'], force=True)
-
-        # Write data to volume
-        file3_md5 = self.create_md5_new_file(
-            instance_ip, dev_name=volume_device_name, filename="file3",
-            private_key=self.keypair['private_key'],
-            server=instance_ip)
-
-        # Create third snapshot
-        snapshot3 = self.create_volume_snapshot(volume['id'], force=True)
+            # Create snapshot
+            snap_map[i] = self.create_volume_snapshot(volume['id'],
+                                                      force=True)
 
         # Detach the volume
         self.nova_volume_detach(server, volume)
 
-        snap_map = {1: snapshot1, 2: snapshot2, 3: snapshot3}
-        file_map = {1: file1_md5, 2: file2_md5, 3: file3_md5}
-
-        # Loop over 3 times to check the data integrity of all 3 snapshots
-        for i in range(1, 4):
-            # Create volume from snapshot, attach it to instance and check file
-            # and contents for snap
-            volume_snap = self.create_volume(snapshot_id=snap_map[i]['id'])
-            volume_device_name, __ = self._attach_and_get_volume_device_name(
-                server, volume_snap, instance_ip, self.keypair['private_key'])
+        # Create a volume from every snapshot without waiting, so the
+        # backend restores them concurrently, then wait for all of them
+        volume_snaps = {}
+        for i in range(1, snapshot_count + 1):
+            volume_snaps[i] = self.create_volume(
+                snapshot_id=snap_map[i]['id'], wait_until=None)
+        for i in range(1, snapshot_count + 1):
+            waiters.wait_for_volume_resource_status(
+                self.volumes_client, volume_snaps[i]['id'], 'available')
+
+        # Attach all the restored volumes at once and check file and
+        # contents for each snapshot through its own device
+        device_names, __ = self._attach_and_get_volumes_device_names(
+            server, list(volume_snaps.values()), instance_ip,
+            self.keypair['private_key'])
+        for i in range(1, snapshot_count + 1):
             count_snap, md5_file = self.get_md5_from_file(
                 server, instance_ip, 'file' + str(i),
-                dev_name=volume_device_name)
-            # Detach the volume
-            self.nova_volume_detach(server, volume_snap)
+                dev_name=device_names[volume_snaps[i]['id']])
 
             self.assertEqual(count_snap, i)
             self.assertEqual(file_map[i], md5_file)
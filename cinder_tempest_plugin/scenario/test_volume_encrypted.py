@@ -18,11 +18,15 @@ from tempest.lib import decorators
 
 from tempest.scenario import manager
 
+from cinder_tempest_plugin.scenario import manager as cinder_manager
+
 CONF = config.CONF
 
 
 class TestEncryptedCinderVolumes(manager.EncryptionScenarioTest,
-                                 manager.ScenarioTest):
+                                 cinder_manager.ScenarioTest):
+
+    uses_server_pool = True
 
     @classmethod
     def skip_checks(cls):
@@ -47,7 +51,6 @@ class TestEncryptedCinderVolumes(manager.EncryptionScenarioTest,
         waiters.wait_for_server_termination(self.servers_client, server['id'])
 
     def create_encrypted_volume_from_image(self, encryption_provider,
-                                           volume_type='luks',
                                            key_size=256,
                                            cipher='aes-xts-plain64',
                                            control_location='front-end',
@@ -60,12 +63,11 @@ class TestEncryptedCinderVolumes(manager.EncryptionScenarioTest,
             '$classname-volume-origin' by default
         :param **kwargs: additional parameters
         """
-        volume_type = self.create_volume_type(name=volume_type)
-        self.create_encryption_type(type_id=volume_type['id'],
-                                    provider=encryption_provider,
-                                    key_size=key_size,
-                                    cipher=cipher,
-                                    control_location=control_location)
+        volume_type = self.get_shared_volume_type(
+            encryption={'provider': encryption_provider,
+                        'key_size': key_size,
+                        'cipher': cipher,
+                        'control_location': control_location})
         image_id = kwargs.pop('image_id', CONF.compute.image_ref)
         name = kwargs.pop('name', None)
         if not name:
@@ -87,7 +89,12 @@ class TestEncryptedCinderVolumes(manager.EncryptionScenarioTest,
 
         """
 
-        volume = self.create_encrypted_volume('luks', volume_type='luks')
+        volume_type = self.get_shared_volume_type(
+            encryption={'provider': 'luks',
+                        'key_size': 256,
+                        'cipher': 'aes-xts-plain64',
+                        'control_location': 'front-end'})
+        volume = self.create_volume(volume_type=volume_type['name'])
         kwargs = {
             'display_name': data_utils.rand_name(self.__class__.__name__),
             'source_volid': volume['id'],
@@ -104,9 +111,8 @@ class TestEncryptedCinderVolumes(manager.EncryptionScenarioTest,
             volume_s['id'])['volume']
         validation_resources = self.get_test_validation_resources(
             self.os_primary)
-        server = self.create_server(wait_until='SSHABLE',
-                                    validatable=True,
-                                    validation_resources=validation_resources)
+        server, __, __ = self.create_or_lease_server(
+            validatable=True, validation_resources=validation_resources)
         self.attach_detach_volume(server, volume_source)
 
     @decorators.idempotent_id('5bb622ab-5060-48a8-8840-d589a548b7e4')
@@ -0,0 +1,94 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from oslo_log import log
+from tempest.common import utils
+from tempest import config
+from tempest.lib import decorators
+from tempest.lib import exceptions as lib_exc
+from testtools import content
+
+from cinder_tempest_plugin.common import fio
+from cinder_tempest_plugin.scenario import manager
+
+CONF = config.CONF
+
+LOG = log.getLogger(__name__)
+
+
+class VolumeFioBenchmarkTest(manager.ScenarioTest):
+
+    @classmethod
+    def skip_checks(cls):
+        super(VolumeFioBenchmarkTest, cls).skip_checks()
+        if not CONF.volume_feature_enabled.fio_benchmark_tests:
+            raise cls.skipException("fio benchmark tests are disabled.")
+
+    def setUp(self):
+        super(VolumeFioBenchmarkTest, self).setUp()
+        self.validation_resources = self.get_test_validation_resources(
+            self.os_primary)
+        if 'keypair' in self.validation_resources:
+            self.keypair = self.validation_resources['keypair']
+        else:
+            self.keypair = self.create_keypair()
+        self.security_group = self.create_security_group()
+
+    @decorators.idempotent_id('bf364828-9a71-4c2d-a46c-d42898c6bc44')
+    @utils.services('compute', 'volume', 'image', 'network')
+    def test_attached_volume_fio_benchmark(self):
+        """Measure the I/O performance of a volume attached through Nova
+
+        * Boot an instance and attach an empty volume to it
+        * Run the configured fio job matrix against the volume device
+        * Attach IOPS, bandwidth and latency percentiles of every job to
+          the test result as 'fio-results'
+        """
+        server = self.create_server(
+            key_name=self.keypair['name'],
+            validatable=True,
+            validation_resources=self.validation_resources,
+            wait_until='SSHABLE',
+            security_groups=[{'name': self.security_group['name']}])
+        volume = self.create_volume()
+        instance_ip = self.get_server_ip(server)
+
+        volume_device_name, __ = self._attach_and_get_volume_device_name(
+            server, volume, instance_ip, self.keypair['private_key'])
+        device = '/dev/' + volume_device_name
+
+        ssh_client = self.get_remote_client(
+            instance_ip, private_key=self.keypair['private_key'],
+            server=server)
+        try:
+            ssh_client.exec_command('command -v fio')
+        except lib_exc.SSHExecCommandFailed:
+            raise self.skipException('fio is not available in the guest')
+
+        results = []
+        for job in fio.job_matrix(CONF.volume.fio_rw_modes,
+                                  CONF.volume.fio_block_sizes,
+                                  CONF.volume.fio_iodepths):
+            command = fio.build_command(
+                device, runtime=CONF.volume.fio_runtime,
+                size=CONF.volume.fio_size, **job)
+            job_results = fio.parse_output(ssh_client.exec_command(command))
+            for result in job_results:
+                result.update(job)
+                LOG.info('fio %s', result)
+            results.extend(job_results)
+
+        self.addDetail('fio-results', content.json_content(results))
+        self.assertNotEmpty(results)
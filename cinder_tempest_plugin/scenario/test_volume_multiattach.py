@@ -13,15 +13,24 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
+from tempest.common import waiters
 from tempest import config
 from tempest.lib import decorators
 from tempest.lib import exceptions as lib_exc
+from testtools import content
 
+from cinder_tempest_plugin.common import concurrency
 from cinder_tempest_plugin.scenario import manager
 from tempest.scenario import manager as tempest_manager
 
 CONF = config.CONF
 
+# Size of the blocks checksummed separately when comparing the data seen by
+# the servers, so a mismatch is reported with the byte ranges it spans
+DIGEST_BLOCK_SIZE = 4096
+
 
 class VolumeMultiattachTests(manager.ScenarioTest,
                              tempest_manager.EncryptionScenarioTest):
@@ -29,6 +38,8 @@ class VolumeMultiattachTests(manager.ScenarioTest,
     compute_min_microversion = '2.60'
     compute_max_microversion = 'latest'
 
+    uses_server_pool = True
+
     def setUp(self):
         super(VolumeMultiattachTests, self).setUp()
         self.validation_resources = self.get_test_validation_resources(
@@ -53,19 +64,85 @@ class VolumeMultiattachTests(manager.ScenarioTest,
             [attachment['server_id'] for attachment in volume['attachments']])
         self.assertIn(server_id, server_ids)
 
+    def _attach_to_servers(self, volume, servers):
+        """Attach a multiattach volume to all servers in parallel.
+
+        Every attach request is sent before any of them is waited for, then
+        the volume is polled until it is attached to all the servers.
+
+        :returns: a dict mapping each server ID to the time in seconds
+            between its attach request and the first poll that showed the
+            attachment.
+        """
+        servers_by_id = {server['id']: server for server in servers}
+        requested = {}
+        latencies = {}
+        try:
+            for server in servers:
+                requested[server['id']] = time.monotonic()
+                self.servers_client.attach_volume(server['id'],
+                                                  volumeId=volume['id'])
+
+            start = time.monotonic()
+            while len(latencies) < len(servers):
+                attachments = self.volumes_client.show_volume(
+                    volume['id'])['volume']['attachments']
+                now = time.monotonic()
+                for attachment in attachments:
+                    server_id = attachment['server_id']
+                    if server_id in requested and server_id not in latencies:
+                        latencies[server_id] = now - requested[server_id]
+                        # Cleanups run in reverse order, so the detach runs
+                        # before the wait for the attachment removal, as in
+                        # attach_volume.
+                        self.addCleanup(
+                            waiters.wait_for_volume_attachment_remove,
+                            self.volumes_client, volume['id'],
+                            attachment['attachment_id'])
+                        self.addCleanup(self._detach_volume,
+                                        servers_by_id[server_id], volume)
+                if len(latencies) == len(servers):
+                    break
+                if now - start >= self.volumes_client.build_timeout:
+                    raise lib_exc.TimeoutException(
+                        'Volume %s was not attached to servers %s within '
+                        '%s s' % (volume['id'],
+                                  sorted(set(requested) - set(latencies)),
+                                  self.volumes_client.build_timeout))
+                time.sleep(self.volumes_client.build_interval)
+        except Exception:
+            # Still detach the volume from the servers it was requested on
+            # but not seen attached to
+            for server_id in set(requested) - set(latencies):
+                self.addCleanup(self._detach_volume,
+                                servers_by_id[server_id], volume)
+            raise
+        return latencies
+
+    def _read_device_from_server(self, index, resource_ids, servers,
+                                 server_ips, disks_before):
+        """Find the multiattach device on a server and read its digests."""
+        private_key = self.keypair['private_key']
+        device_name = self._attached_volume_name(
+            disks_before[index], server_ips[index], private_key)
+        data = self.read_data_from_device(
+            server_ips[index], '/dev/' + device_name,
+            private_key=private_key, server=servers[index],
+            block_size=DIGEST_BLOCK_SIZE)
+        resource_ids.append((index, data))
+
     @decorators.idempotent_id('e6604b85-5280-4f7e-90b5-186248fd3423')
     def test_multiattach_data_integrity(self):
 
-        # Create an instance
-        server_1 = self.create_server(
-            key_name=self.keypair['name'],
-            wait_until='SSHABLE',
+        # Create an instance, or lease one from the class server pool
+        server_1, instance_ip, self.keypair = self.create_or_lease_server(
+            self.keypair,
             validatable=True,
             validation_resources=self.validation_resources,
             security_groups=[{'name': self.security_group['name']}])
 
         # Create multiattach type
-        multiattach_vol_type = self.create_volume_type(
+        multiattach_vol_type = self.get_shared_volume_type(
             extra_specs={'multiattach': "<is> True"})
 
         # Create a multiattach volume
@@ -76,11 +153,16 @@ class VolumeMultiattachTests(manager.ScenarioTest,
 
         # Create other volume
         if CONF.compute_feature_enabled.attach_encrypted_volume:
-            other_volume = self.create_encrypted_volume(
-                'luks', volume_type='luks')
+            luks_vol_type = self.get_shared_volume_type(
+                encryption={'provider': 'luks',
+                            'key_size': 256,
+                            'cipher': 'aes-xts-plain64',
+                            'control_location': 'front-end'})
+            other_volume = self.create_volume(
+                volume_type=luks_vol_type['id'])
         else:
             # Create secondary volume type
-            second_vol_type = self.create_volume_type()
+            second_vol_type = self.get_shared_volume_type()
 
             other_volume = self.create_volume(
                 volume_type=second_vol_type['id'])
@@ -91,8 +173,6 @@ class VolumeMultiattachTests(manager.ScenarioTest,
         self.attach_volume(server_1, default_volume)
         self.attach_volume(server_1, other_volume)
 
-        instance_ip = self.get_server_ip(server_1)
-
         # Attach volume to instance and find it's device name (eg: /dev/vdb)
         volume_device_name_inst_1, __ = (
             self._attach_and_get_volume_device_name(
@@ -104,18 +184,15 @@ class VolumeMultiattachTests(manager.ScenarioTest,
         # verify when reading data from second server
         device_data_inst_1 = self.write_data_to_device(
             instance_ip, out_device, private_key=self.keypair['private_key'],
-            server=server_1, sha_sum=True)
+            server=server_1, block_size=DIGEST_BLOCK_SIZE)
 
-        # Create another instance
-        server_2 = self.create_server(
-            key_name=self.keypair['name'],
+        # Create another instance, or lease one from the class server pool
+        server_2, instance_2_ip, self.keypair = self.create_or_lease_server(
+            self.keypair,
             validatable=True,
             validation_resources=self.validation_resources,
-            wait_until='SSHABLE',
             security_groups=[{'name': self.security_group['name']}])
 
-        instance_2_ip = self.get_server_ip(server_2)
-
         # Attach volume to instance and find it's device name (eg: /dev/vdc)
         volume_device_name_inst_2, __ = (
             self._attach_and_get_volume_device_name(
@@ -126,24 +203,103 @@ class VolumeMultiattachTests(manager.ScenarioTest,
         # Read data from volume device
         device_data_inst_2 = self.read_data_from_device(
             instance_2_ip, in_device, private_key=self.keypair['private_key'],
-            server=server_2, sha_sum=True)
+            server=server_2, block_size=DIGEST_BLOCK_SIZE)
 
         self._verify_attachment(volume['id'], server_1['id'])
         self._verify_attachment(volume['id'], server_2['id'])
-        self.assertEqual(device_data_inst_1, device_data_inst_2)
+        self.assert_block_digests_equal(device_data_inst_1,
+                                        device_data_inst_2, DIGEST_BLOCK_SIZE)
+
+    @decorators.idempotent_id('c886b843-04d9-4612-9f91-22245871f729')
+    def test_multiattach_fan_out(self):
+        """Attach one multiattach volume to many servers in parallel
+
+        * Boot `[volume] multiattach_server_count` servers concurrently
+        * Write data to the volume from the first server
+        * Attach the volume to all other servers in parallel, recording
+          the attach latency of each of them
+        * Read the data back from all the other servers concurrently and
+          check every server sees what the first one wrote
+        """
+        server_count = CONF.volume.multiattach_server_count
+        if server_count < 2:
+            raise self.skipException(
+                'The fan-out scenario needs at least 2 servers.')
+
+        # Send all the boot requests first so the servers build in parallel
+        servers = []
+        for _ in range(server_count):
+            servers.append(self.create_server(
+                key_name=self.keypair['name'],
+                validatable=True,
+                validation_resources=self.validation_resources,
+                wait_until=None,
+                security_groups=[{'name': self.security_group['name']}]))
+        for server in servers:
+            waiters.wait_for_server_status(self.servers_client, server['id'],
+                                           'ACTIVE')
+        server_ips = [self.get_server_ip(server) for server in servers]
+        disks_before = []
+        for server, server_ip in zip(servers, server_ips):
+            # Getting the remote client also waits for the guest to be
+            # reachable over SSH
+            ssh_client = self.get_remote_client(
+                server_ip, private_key=self.keypair['private_key'],
+                server=server)
+            disks_before.append(ssh_client.list_disks())
+
+        # Create a multiattach volume
+        multiattach_vol_type = self.get_shared_volume_type(
+            extra_specs={'multiattach': "<is> True"})
+        volume = self.create_volume(volume_type=multiattach_vol_type['id'])
+
+        # Write data from the first server
+        volume_device_name, __ = self._attach_and_get_volume_device_name(
+            servers[0], volume, server_ips[0], self.keypair['private_key'])
+        written_data = self.write_data_to_device(
+            server_ips[0], '/dev/' + volume_device_name,
+            private_key=self.keypair['private_key'], server=servers[0],
+            block_size=DIGEST_BLOCK_SIZE)
+
+        # Attach the volume to every other server in parallel
+        latencies = sorted(self._attach_to_servers(volume,
+                                                   servers[1:]).values())
+        self.addDetail('attach-latency', content.json_content({
+            'servers': len(latencies),
+            'min': latencies[0],
+            'median': latencies[len(latencies) // 2],
+            'p90': latencies[min(len(latencies) - 1,
+                                 int(len(latencies) * 0.9))],
+            'max': latencies[-1],
+        }))
+
+        # Read the data back from all the other servers concurrently
+        read_data = concurrency.run_concurrent_tasks(
+            self._read_device_from_server,
+            resource_count=server_count - 1,
+            servers=servers[1:],
+            server_ips=server_ips[1:],
+            disks_before=disks_before[1:])
+
+        for server in servers:
+            self._verify_attachment(volume['id'], server['id'])
+        self.assertEqual(server_count - 1, len(read_data))
+        for index, data in read_data:
+            self.assert_block_digests_equal(
+                written_data, data, DIGEST_BLOCK_SIZE,
+                'Server %s read different data' % servers[index + 1]['id'])
 
     @decorators.idempotent_id('53514da8-f49c-4cda-8792-ff4a2fa69977')
     def test_volume_multiattach_same_host_negative(self):
-        # Create an instance
-        server = self.create_server(
-            key_name=self.keypair['name'],
+        # Create an instance, or lease one from the class server pool
+        server, __, __ = self.create_or_lease_server(
+            self.keypair,
             validatable=True,
             validation_resources=self.validation_resources,
-            wait_until='SSHABLE',
             security_groups=[{'name': self.security_group['name']}])
 
         # Create multiattach type
-        multiattach_vol_type = self.create_volume_type(
+        multiattach_vol_type = self.get_shared_volume_type(
             extra_specs={'multiattach': "<is> True"})
 
         # Create an empty volume
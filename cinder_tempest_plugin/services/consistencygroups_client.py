@@ -21,6 +21,7 @@ from oslo_serialization import jsonutils as json
 from tempest.lib.common import rest_client
 from tempest.lib import exceptions as lib_exc
 
+from cinder_tempest_plugin.common import instrumentation
 from cinder_tempest_plugin import exceptions as volume_exc
 
 
@@ -30,6 +31,7 @@ class ConsistencyGroupsClient(rest_client.RestClient):
     def __init__(self, auth_provider, service, region, **kwargs):
         super(ConsistencyGroupsClient, self).__init__(
             auth_provider, service, region, **kwargs)
+        instrumentation.instrument(self)
 
     def create_consistencygroup(self, volume_types, **kwargs):
         """Creates a consistency group."""
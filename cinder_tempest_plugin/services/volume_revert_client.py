@@ -17,6 +17,8 @@ from oslo_serialization import jsonutils as json
 from tempest.lib.common import rest_client
 from tempest.lib.services.volume import base_client
 
+from cinder_tempest_plugin.common import instrumentation
+
 
 class VolumeRevertClient(base_client.BaseClient):
     """Client class to send revert to snapshot action API request"""
@@ -24,6 +26,7 @@ class VolumeRevertClient(base_client.BaseClient):
     def __init__(self, auth_provider, service, region, **kwargs):
         super(VolumeRevertClient, self).__init__(
             auth_provider, service, region, **kwargs)
+        instrumentation.instrument(self)
         # revert needs v3 of the volume API
         self.api_version = 'v3'
 
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the startup cost the plugin adds to every tempest process
+
+Tempest loads the plugin in every process it starts, including each stestr
+worker and `tempest list-plugins`. This script times, in fresh
+interpreters, the plugin import together with load_tests, register_opts and
+get_opt_lists, and subtracts the cost of the tempest modules any plugin
+needs anyway. It fails when the median exceeds the threshold.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+BASELINE = '''
+import time
+start = time.perf_counter()
+from tempest import config
+from tempest.test_discover import plugins
+print(time.perf_counter() - start)
+'''
+
+PLUGIN = '''
+import time
+start = time.perf_counter()
+from tempest import config
+from tempest.test_discover import plugins
+from oslo_config import cfg
+from cinder_tempest_plugin import plugin
+cinder_plugin = plugin.CinderTempestPlugin()
+cinder_plugin.load_tests()
+cinder_plugin.register_opts(cfg.ConfigOpts())
+cinder_plugin.get_opt_lists()
+print(time.perf_counter() - start)
+'''
+
+
+def _measure(code, runs):
+    return [float(subprocess.check_output([sys.executable, '-c', code]))
+            for _ in range(runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10,
+                        help='Number of interpreters to time.')
+    parser.add_argument('--threshold', type=float, default=100.0,
+                        help='Maximum median plugin startup cost, in '
+                             'milliseconds.')
+    args = parser.parse_args()
+
+    baseline = statistics.median(_measure(BASELINE, args.runs))
+    total = statistics.median(_measure(PLUGIN, args.runs))
+    cost = (total - baseline) * 1000
+    print('tempest: %.1f ms, with plugin: %.1f ms, plugin cost: %.1f ms '
+          '(threshold %.1f ms)' % (baseline * 1000, total * 1000, cost,
+                                   args.threshold))
+    if cost > args.threshold:
+        print('Plugin startup cost is over the threshold')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import testtools
+
+from cinder_tempest_plugin.common import dependency_graph
+from cinder_tempest_plugin.common import waiters as volume_waiters
+
+
+class _PagedSnapshotsClient(object):
+    """Lists snapshots two at a time, the way Cinder truncates its lists"""
+
+    def __init__(self, snapshot_ids):
+        self.snapshot_ids = snapshot_ids
+        self.calls = []
+
+    def list_snapshots(self, detail=False, **params):
+        self.calls.append(params)
+        start = 0
+        if 'marker' in params:
+            start = self.snapshot_ids.index(params['marker']) + 1
+        page = self.snapshot_ids[start:start + 2]
+        body = {'snapshots': [{'id': snapshot_id, 'volume_id': 'volume',
+                               'status': 'available'}
+                              for snapshot_id in page]}
+        if start + 2 < len(self.snapshot_ids):
+            body['snapshots_links'] = [{
+                'rel': 'next',
+                'href': 'http://cinder/v3/project/snapshots/detail'
+                        '?limit=2&marker=%s' % page[-1]}]
+        return body
+
+
+class DependencyGraphTest(testtools.TestCase):
+
+    def test_list_resources_follows_next_links(self):
+        client = _PagedSnapshotsClient(['a', 'b', 'c', 'd', 'e'])
+
+        listed = volume_waiters.list_resources(client, 'snapshot')
+
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'],
+                         [snapshot['id'] for snapshot in listed])
+        self.assertEqual([{}, {'limit': '2', 'marker': 'b'},
+                          {'limit': '2', 'marker': 'd'}], client.calls)
+
+    def test_discover_finds_resources_past_the_first_page(self):
+        client = _PagedSnapshotsClient(['a', 'b', 'c'])
+
+        blockers = dependency_graph.discover(None, client,
+                                             snapshot_ids=['c'])
+
+        self.assertEqual({(dependency_graph.SNAPSHOT, 'c'): set()}, blockers)
+
+    def test_delete_all_backups_without_client(self):
+        self.assertRaises(ValueError, dependency_graph.delete_all,
+                          None, None, backup_ids=['backup'])
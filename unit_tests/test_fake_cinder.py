@@ -0,0 +1,144 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+from tempest.lib import auth
+from tempest.lib import exceptions as lib_exc
+from tempest.lib.services.volume.v3 import backups_client
+from tempest.lib.services.volume.v3 import snapshots_client
+from tempest.lib.services.volume.v3 import volumes_client
+import testtools
+
+from cinder_tempest_plugin.common import fake_cinder
+from cinder_tempest_plugin.common import waiters as volume_waiters
+
+
+class FakeCinderClientsTest(testtools.TestCase):
+    """Drive the tempest volume clients against the fake server
+
+    The clients validate every response against their schemas, so these
+    tests fail as soon as a view of the fake drifts from the Cinder API.
+    """
+
+    def setUp(self):
+        super(FakeCinderClientsTest, self).setUp()
+        server = fake_cinder.FakeCinderServer(
+            transition_delay='constant:0.05').start()
+        self.addCleanup(server.stop)
+        credentials = auth.KeystoneV3Credentials(
+            username='fake', password='fake', project_name='demo',
+            user_domain_name='Default', project_domain_name='Default')
+        provider = auth.KeystoneV3AuthProvider(credentials,
+                                               server.identity_uri)
+        client_kwargs = dict(auth_provider=provider, service='volumev3',
+                             region='RegionOne', build_interval=0.01,
+                             build_timeout=5)
+        self.volumes_client = volumes_client.VolumesClient(**client_kwargs)
+        self.snapshots_client = snapshots_client.SnapshotsClient(
+            **client_kwargs)
+        self.backups_client = backups_client.BackupsClient(**client_kwargs)
+
+    def _create_volume(self, **kwargs):
+        volume = self.volumes_client.create_volume(size=1, **kwargs)['volume']
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, volume['id'], 'available')
+        return volume
+
+    def _delete(self, client, delete, resource_id):
+        delete(resource_id)
+        volume_waiters.wait_for_resource_deletion(client, resource_id)
+
+    def test_volumes(self):
+        volume = self._create_volume(name='volume')
+        clone = self._create_volume(source_volid=volume['id'])
+
+        shown = self.volumes_client.show_volume(clone['id'])['volume']
+        self.assertEqual(volume['id'], shown['source_volid'])
+        self.assertEqual('available', shown['status'])
+        self.assertIsNotNone(shown['updated_at'])
+        self.volumes_client.update_volume(volume['id'], name='renamed')
+        self.assertEqual(
+            {volume['id'], clone['id']},
+            {v['id'] for v in self.volumes_client.list_volumes()['volumes']})
+        self.assertIn(
+            'renamed',
+            [v['name'] for v in
+             self.volumes_client.list_volumes(detail=True)['volumes']])
+
+        self._delete(self.volumes_client, self.volumes_client.delete_volume,
+                     clone['id'])
+        self._delete(self.volumes_client, self.volumes_client.delete_volume,
+                     volume['id'])
+        self.assertRaises(lib_exc.NotFound, self.volumes_client.show_volume,
+                          volume['id'])
+
+    def test_snapshots(self):
+        volume = self._create_volume()
+        snapshot = self.snapshots_client.create_snapshot(
+            volume_id=volume['id'], name='snapshot')['snapshot']
+        volume_waiters.wait_for_volume_resource_status(
+            self.snapshots_client, snapshot['id'], 'available')
+
+        shown = self.snapshots_client.show_snapshot(
+            snapshot['id'])['snapshot']
+        self.assertEqual('100%',
+                         shown['os-extended-snapshot-attributes:progress'])
+        self.snapshots_client.list_snapshots()
+        self.snapshots_client.list_snapshots(detail=True)
+        from_snapshot = self._create_volume(snapshot_id=snapshot['id'])
+        # A volume with snapshots cannot be deleted
+        self.assertRaises(lib_exc.BadRequest,
+                          self.volumes_client.delete_volume, volume['id'])
+
+        self._delete(self.volumes_client, self.volumes_client.delete_volume,
+                     from_snapshot['id'])
+        self._delete(self.snapshots_client,
+                     self.snapshots_client.delete_snapshot, snapshot['id'])
+        self._delete(self.volumes_client, self.volumes_client.delete_volume,
+                     volume['id'])
+
+    def test_backups(self):
+        volume = self._create_volume()
+        full = self.backups_client.create_backup(
+            volume_id=volume['id'], name='full')['backup']
+        volume_waiters.wait_for_volume_resource_status(
+            self.backups_client, full['id'], 'available')
+        incremental = self.backups_client.create_backup(
+            volume_id=volume['id'], incremental=True)['backup']
+        volume_waiters.wait_for_volume_resource_status(
+            self.backups_client, incremental['id'], 'available')
+
+        self.assertTrue(self.backups_client.show_backup(
+            full['id'])['backup']['has_dependent_backups'])
+        self.assertTrue(self.backups_client.show_backup(
+            incremental['id'])['backup']['is_incremental'])
+        self.backups_client.list_backups()
+        self.backups_client.list_backups(detail=True)
+        # The full backup cannot go before its incremental backup
+        self.assertRaises(lib_exc.BadRequest,
+                          self.backups_client.delete_backup, full['id'])
+
+        restore = self.backups_client.restore_backup(
+            incremental['id'])['restore']
+        volume_waiters.wait_for_volume_resource_status(
+            self.volumes_client, restore['volume_id'], 'available')
+        volume_waiters.wait_for_volume_resource_status(
+            self.backups_client, incremental['id'], 'available')
+
+        for backup_id in (incremental['id'], full['id']):
+            self._delete(self.backups_client,
+                         self.backups_client.delete_backup, backup_id)
+        for volume_id in (restore['volume_id'], volume['id']):
+            self._delete(self.volumes_client,
+                         self.volumes_client.delete_volume, volume_id)
@@ -0,0 +1,60 @@
+# Copyright 2026 Red Hat, Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+
+import glob
+import multiprocessing
+import os
+
+import fixtures
+import testtools
+
+from cinder_tempest_plugin.common import profiling
+
+
+def _profiled_child():
+    with profiling.profile('child'):
+        sum(range(1000))
+
+
+class ProfileTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ProfileTest, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.EnvironmentVariable(profiling.ENV_DIR,
+                                                     self.directory))
+
+    def _profiles(self, name):
+        return glob.glob(os.path.join(self.directory, name + '.*.prof'))
+
+    def test_nested_in_process(self):
+        with profiling.profile('outer'):
+            with profiling.profile('inner'):
+                sum(range(1000))
+
+        self.assertEqual(1, len(self._profiles('outer')))
+        self.assertEqual([], self._profiles('inner'))
+
+    def test_nested_in_forked_worker(self):
+        # Like a profiled test calling run_concurrent_tasks
+        with profiling.profile('parent'):
+            worker = multiprocessing.get_context('fork').Process(
+                target=_profiled_child)
+            worker.start()
+            worker.join()
+
+        self.assertEqual(0, worker.exitcode)
+        self.assertEqual(1, len(self._profiles('parent')))
+        self.assertEqual(1, len(self._profiles('child')))